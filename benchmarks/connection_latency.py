@@ -0,0 +1,76 @@
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libreoffice import CalcDoc, OfficeWorker
+
+ROWS = 20
+COLUMNS = 10
+
+def tool_calls(sheet):
+    # The UNO calls behind typical get_cell_value, get_range_values and set_range_values requests
+    data = tuple(tuple(float(row * COLUMNS + col) for col in range(COLUMNS)) for row in range(ROWS))
+    return {
+        "get_cell_value": lambda: sheet.getCellByPosition(1, 1).getValue(),
+        "get_range_values": lambda: sheet.getCellRangeByName(f"A1:J{ROWS}").getDataArray(),
+        "set_range_values": lambda: sheet.getCellRangeByPosition(0, 0, COLUMNS - 1, ROWS - 1).setDataArray(data)
+    }
+
+def measure(worker, repeats: int):
+    doc = CalcDoc.create_doc(lo_inst=worker.lo_inst)
+    try:
+        sheet = doc.component.getSheets().getByIndex(0)
+        results = {"ping": []}
+        calls = tool_calls(sheet)
+        for name in calls:
+            results[name] = []
+        for _ in range(repeats):
+            results["ping"].append(worker.ping())
+            for name, call in calls.items():
+                started = time.perf_counter()
+                call()
+                results[name].append(time.perf_counter() - started)
+        return {name: statistics.median(timings) for name, timings in results.items()}
+    finally:
+        doc.close_doc()
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-call latency of the socket and named pipe connectors against soffice instances spawned by this script")
+    parser.add_argument("--binary", default=os.getenv("LIBREOFFICE_BINARY", "soffice"))
+    parser.add_argument("--port", type=int, default=2099, help="Port for the socket instance")
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    profile_root = tempfile.mkdtemp(prefix="libreoffice-mcp-bench-")
+    workers = {
+        "socket": OfficeWorker(0, args.port, profile_dir=os.path.join(profile_root, "socket")),
+        "pipe": OfficeWorker(1, 0, pipe_name=f"libreoffice_mcp_bench_{os.getpid()}", profile_dir=os.path.join(profile_root, "pipe"))
+    }
+    try:
+        for worker in workers.values():
+            worker.spawn(args.binary)
+            worker.connect_when_ready(args.startup_timeout)
+        results = {name: measure(worker, args.repeats) for name, worker in workers.items()}
+        print(f"{'call':<20} {'socket (us)':>12} {'pipe (us)':>12} {'speedup':>8}")
+        for call in results["socket"]:
+            socket_us = results["socket"][call] * 1e6
+            pipe_us = results["pipe"][call] * 1e6
+            print(f"{call:<20} {socket_us:>12.1f} {pipe_us:>12.1f} {socket_us / pipe_us:>7.2f}x")
+        print(f"(median of {args.repeats} calls each)")
+    finally:
+        for worker in reversed(list(workers.values())):
+            try:
+                worker.close()
+            except Exception as e:
+                print(f"Failed to close soffice on {worker.address}: {e}")
+        shutil.rmtree(profile_root, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
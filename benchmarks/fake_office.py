@@ -0,0 +1,654 @@
+import collections
+import functools
+import re
+import sys
+import threading
+import time
+import types
+
+class Bridge:
+    # Counts every call that would cross the UNO bridge and optionally charges a fixed latency for it
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.latency = 0.0
+        self.lock = threading.Lock()
+
+    def call(self, name: str):
+        with self.lock:
+            self.calls[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+BRIDGE = Bridge()
+
+def remote(fn):
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        BRIDGE.call(f"{type(self).__name__}.{fn.__name__}")
+        return fn(self, *args, **kwargs)
+    return wrapper
+
+def parse_address(address: str):
+    match = re.fullmatch(r"\$?([A-Za-z]+)\$?(\d+)", address.strip())
+    if not match:
+        raise ValueError(f"Invalid cell address '{address}'")
+    col = 0
+    for ch in match.group(1).upper():
+        col = col * 26 + (ord(ch) - ord("A") + 1)
+    return col - 1, int(match.group(2)) - 1
+
+class Struct:
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.fields, args):
+            setattr(self, name, value)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+class PropertyValue(Struct):
+    fields = ("Name", "Handle", "Value", "State")
+
+class CellAddress(Struct):
+    fields = ("Sheet", "Column", "Row")
+
+class CellRangeAddress(Struct):
+    fields = ("Sheet", "StartColumn", "StartRow", "EndColumn", "EndRow")
+
+class SortField(Struct):
+    fields = ("Field", "SortAscending", "FieldType")
+
+# Calc
+
+class ConditionalEntries:
+    def __init__(self):
+        self.entries = []
+
+    @remote
+    def clear(self):
+        self.entries = []
+
+    @remote
+    def addNew(self, props):
+        self.entries.append({prop.Name: prop.Value for prop in props})
+
+class CellRange:
+    def __init__(self, sheet, start_col: int, start_row: int, end_col: int, end_row: int):
+        self.sheet = sheet
+        self.address = CellRangeAddress(sheet.index, start_col, start_row, end_col, end_row)
+
+    def key(self):
+        addr = self.address
+        return (addr.StartColumn, addr.StartRow, addr.EndColumn, addr.EndRow)
+
+    def positions(self):
+        addr = self.address
+        return [[(row, col) for col in range(addr.StartColumn, addr.EndColumn + 1)] for row in range(addr.StartRow, addr.EndRow + 1)]
+
+    @remote
+    def getRangeAddress(self):
+        return self.address
+
+    @remote
+    def getDataArray(self):
+        return tuple(tuple(self.sheet.cells.get(pos, "") for pos in row) for row in self.positions())
+
+    def write(self, data):
+        for row, values in zip(self.positions(), data):
+            for pos, value in zip(row, values):
+                self.sheet.put(pos, value)
+
+    @remote
+    def setDataArray(self, data):
+        self.write(data)
+
+    @remote
+    def getFormulaArray(self):
+        return tuple(tuple(str(self.sheet.cells.get(pos, "")) for pos in row) for row in self.positions())
+
+    @remote
+    def setFormulaArray(self, data):
+        self.write(data)
+
+    @remote
+    def getPropertyValue(self, name: str):
+        if name == "ConditionalFormat":
+            return self.sheet.conditional_formats.get(self.key(), ConditionalEntries())
+        raise KeyError(name)
+
+    @remote
+    def setPropertyValue(self, name: str, value):
+        if name == "ConditionalFormat":
+            self.sheet.conditional_formats[self.key()] = value
+
+class Spreadsheet:
+    def __init__(self, index: int):
+        self.index = index
+        self.cells = {}
+        self.conditional_formats = {}
+
+    def put(self, pos, value):
+        if value == "" or value is None:
+            self.cells.pop(pos, None)
+        else:
+            self.cells[pos] = value
+
+    @remote
+    def getCellRangeByName(self, name: str):
+        start, _, end = name.partition(":")
+        start_col, start_row = parse_address(start)
+        end_col, end_row = parse_address(end or start)
+        return CellRange(self, start_col, start_row, end_col, end_row)
+
+    @remote
+    def getCellRangeByPosition(self, start_col: int, start_row: int, end_col: int, end_row: int):
+        return CellRange(self, start_col, start_row, end_col, end_row)
+
+class CalcCell:
+    def __init__(self, sheet: Spreadsheet, pos):
+        self.sheet = sheet
+        self.pos = pos
+
+    @property
+    def value(self):
+        BRIDGE.call("CalcCell.value")
+        return self.sheet.cells.get(self.pos, 0.0)
+
+    @value.setter
+    def value(self, value):
+        BRIDGE.call("CalcCell.value")
+        self.sheet.put(self.pos, value)
+
+    @remote
+    def is_empty(self) -> bool:
+        return self.pos not in self.sheet.cells
+
+class CalcCellRange:
+    def __init__(self, sheet: Spreadsheet, address: str):
+        self.range = sheet.getCellRangeByName(address)
+        self.props = {}
+
+    @remote
+    def set_font_name(self, name: str):
+        self.props["CharFontName"] = name
+
+    @remote
+    def set_font_size(self, size: float):
+        self.props["CharHeight"] = size
+
+    @remote
+    def set_font_weight(self, weight: float):
+        self.props["CharWeight"] = weight
+
+    @remote
+    def set_font_slant(self, slant):
+        self.props["CharPosture"] = slant
+
+    @remote
+    def set_hori_justification(self, justification):
+        self.props["HoriJustify"] = justification
+
+    @remote
+    def sort(self, fields):
+        cells = self.range.sheet.cells
+        rows = [[cells.get(pos, "") for pos in row] for row in self.range.positions()]
+        for field in reversed(fields):
+            # Numbers sort before text, as in Calc
+            rows.sort(key=lambda row: (isinstance(row[field.Field], str), row[field.Field]), reverse=not field.SortAscending)
+        self.range.write(rows)
+
+class CalcSheet:
+    def __init__(self, component: Spreadsheet):
+        self.component = component
+
+    def __getitem__(self, address: str) -> CalcCell:
+        col, row = parse_address(address)
+        return CalcCell(self.component, (row, col))
+
+    def rng(self, address: str) -> CalcCellRange:
+        return CalcCellRange(self.component, address)
+
+class CalcSheets:
+    def __init__(self, names):
+        self.by_name = {name: CalcSheet(Spreadsheet(index)) for index, name in enumerate(names)}
+
+    @remote
+    def get_by_name(self, name: str) -> CalcSheet:
+        if name not in self.by_name:
+            raise KeyError(f"Sheet '{name}' not found")
+        return self.by_name[name]
+
+class Style:
+    def __init__(self):
+        self.props = {}
+
+    @remote
+    def setPropertyValue(self, name: str, value):
+        self.props[name] = value
+
+class StyleFamily:
+    def __init__(self):
+        self.styles = {}
+
+    @remote
+    def hasByName(self, name: str) -> bool:
+        return name in self.styles
+
+    @remote
+    def insertByName(self, name: str, style):
+        self.styles[name] = style
+
+class StyleFamilies:
+    def __init__(self):
+        self.families = collections.defaultdict(StyleFamily)
+
+    @remote
+    def getByName(self, name: str):
+        return self.families[name]
+
+class UndoManager:
+    def __init__(self):
+        self.contexts = []
+        self.locked = False
+
+    @remote
+    def lock(self):
+        self.locked = True
+
+    @remote
+    def enterUndoContext(self, title: str):
+        self.contexts.append(title)
+
+    @remote
+    def leaveUndoContext(self):
+        self.contexts.pop()
+
+class OfficeDocument:
+    def __init__(self):
+        self.modified = False
+        self.locks = 0
+        self.auto_calc = True
+        self.style_families = StyleFamilies()
+        self.undo_manager = UndoManager()
+
+    @remote
+    def getUndoManager(self):
+        return self.undo_manager
+
+    @remote
+    def isModified(self) -> bool:
+        return self.modified
+
+    @remote
+    def lockControllers(self):
+        self.locks += 1
+
+    @remote
+    def unlockControllers(self):
+        self.locks -= 1
+
+    @remote
+    def isAutomaticCalculationEnabled(self) -> bool:
+        return self.auto_calc
+
+    @remote
+    def enableAutomaticCalculation(self, enabled: bool):
+        self.auto_calc = enabled
+
+    @remote
+    def getStyleFamilies(self):
+        return self.style_families
+
+    @remote
+    def createInstance(self, service: str):
+        return Style()
+
+class CalcDoc:
+    def __init__(self, sheet_names=("Sheet1",)):
+        self.sheets = CalcSheets(sheet_names)
+        self.component = OfficeDocument()
+
+    @remote
+    def get_sheet_names(self):
+        return list(self.sheets.by_name)
+
+    def close_doc(self):
+        pass
+
+    def fill(self, sheet_name: str, rows: int, cols: int):
+        # Populates cells directly, without counting round trips
+        cells = self.sheets.by_name[sheet_name].component.cells
+        for row in range(rows):
+            for col in range(cols):
+                cells[(row, col)] = float(row * cols + col)
+
+# Writer
+
+class TextRange:
+    def __init__(self, paragraph: int, offset: int):
+        self.paragraph = paragraph
+        self.offset = offset
+
+class TextCursor(TextRange):
+    @remote
+    def goRight(self, count: int, expand: bool):
+        self.offset += count
+        return True
+
+    @remote
+    def getStart(self):
+        return TextRange(self.paragraph, self.offset)
+
+    @remote
+    def gotoRange(self, text_range, expand: bool):
+        self.paragraph, self.offset = text_range.paragraph, text_range.offset
+
+    @remote
+    def setPropertyValue(self, name: str, value):
+        pass
+
+class Paragraph:
+    def __init__(self, text, index: int):
+        self.text = text
+        self.index = index
+
+    @remote
+    def supportsService(self, name: str) -> bool:
+        return name == "com.sun.star.text.Paragraph"
+
+    @remote
+    def getString(self) -> str:
+        return self.text.paragraphs[self.index]
+
+    @remote
+    def getStart(self):
+        return TextRange(self.index, 0)
+
+class Enumeration:
+    def __init__(self, items):
+        self.items = collections.deque(items)
+
+    @remote
+    def hasMoreElements(self) -> bool:
+        return bool(self.items)
+
+    @remote
+    def nextElement(self):
+        return self.items.popleft()
+
+class Text:
+    def __init__(self, paragraphs):
+        self.paragraphs = list(paragraphs)
+
+    @remote
+    def createEnumeration(self):
+        return Enumeration(Paragraph(self, index) for index in range(len(self.paragraphs)))
+
+    @remote
+    def createTextCursorByRange(self, text_range):
+        return TextCursor(text_range.paragraph, text_range.offset)
+
+    @remote
+    def insertString(self, cursor, value: str, absorb: bool):
+        paragraph = self.paragraphs[cursor.paragraph]
+        self.paragraphs[cursor.paragraph] = paragraph[:cursor.offset] + value + paragraph[cursor.offset:]
+
+class TextDocument(OfficeDocument):
+    def __init__(self, paragraphs):
+        super().__init__()
+        self.text = Text(paragraphs)
+
+    @remote
+    def getText(self):
+        return self.text
+
+class WriteDoc:
+    def __init__(self, paragraphs=("",)):
+        self.component = TextDocument(paragraphs)
+
+    def close_doc(self):
+        pass
+
+class DrawDoc:
+    def close_doc(self):
+        pass
+
+# Base
+
+class ResultSetMetaData:
+    def __init__(self, columns):
+        self.columns = columns
+
+    @remote
+    def getColumnCount(self) -> int:
+        return len(self.columns)
+
+    @remote
+    def getColumnName(self, index: int) -> str:
+        return self.columns[index - 1]
+
+    @remote
+    def getColumnTypeName(self, index: int) -> str:
+        return "VARCHAR"
+
+class ResultSet:
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.position = -1
+
+    @remote
+    def getMetaData(self):
+        return ResultSetMetaData(self.columns)
+
+    @remote
+    def next(self) -> bool:
+        self.position += 1
+        return self.position < len(self.rows)
+
+    @remote
+    def getString(self, index: int) -> str:
+        return str(self.rows[self.position][index - 1])
+
+    @remote
+    def close(self):
+        pass
+
+class Statement:
+    def __init__(self, table):
+        self.table = table
+
+    @remote
+    def executeQuery(self, sql: str):
+        return ResultSet(*self.table)
+
+    @remote
+    def executeUpdate(self, sql: str) -> int:
+        return 1 if sql.lstrip().upper().startswith("INSERT") else 0
+
+    @remote
+    def close(self):
+        pass
+
+class PreparedStatement:
+    # Every INSERT lands in the single fake table, whatever its column list
+    def __init__(self, table):
+        self.table = table
+        self.parameters = {}
+        self.batch = []
+
+    def bind(self, index: int, value):
+        self.parameters[index] = value
+
+    @remote
+    def setNull(self, index: int, sql_type: int):
+        self.bind(index, None)
+
+    @remote
+    def setBoolean(self, index: int, value: bool):
+        self.bind(index, value)
+
+    @remote
+    def setLong(self, index: int, value: int):
+        self.bind(index, value)
+
+    @remote
+    def setDouble(self, index: int, value: float):
+        self.bind(index, value)
+
+    @remote
+    def setString(self, index: int, value: str):
+        self.bind(index, value)
+
+    def row(self):
+        return tuple(self.parameters[index] for index in sorted(self.parameters))
+
+    @remote
+    def addBatch(self):
+        self.batch.append(self.row())
+
+    @remote
+    def executeBatch(self):
+        self.table[1].extend(self.batch)
+        counts = (1,) * len(self.batch)
+        self.batch = []
+        return counts
+
+    @remote
+    def executeUpdate(self) -> int:
+        self.table[1].append(self.row())
+        return 1
+
+    @remote
+    def close(self):
+        pass
+
+class DatabaseMetaData:
+    def __init__(self, batch_updates: bool):
+        self.batch_updates = batch_updates
+
+    @remote
+    def supportsBatchUpdates(self) -> bool:
+        return self.batch_updates
+
+    @remote
+    def getTables(self, catalog, schema, pattern: str, types):
+        return ResultSet(["TABLE_CAT", "TABLE_SCHEM", "TABLE_NAME"], [(None, None, "items")])
+
+class Connection:
+    def __init__(self, table, batch_updates: bool = True):
+        self.table = table
+        self.batch_updates = batch_updates
+        self.auto_commit = True
+        self.closed = False
+
+    @remote
+    def createStatement(self):
+        return Statement(self.table)
+
+    @remote
+    def prepareStatement(self, sql: str):
+        return PreparedStatement(self.table)
+
+    @remote
+    def getMetaData(self):
+        return DatabaseMetaData(self.batch_updates)
+
+    @remote
+    def getAutoCommit(self) -> bool:
+        return self.auto_commit
+
+    @remote
+    def setAutoCommit(self, auto_commit: bool):
+        self.auto_commit = auto_commit
+
+    @remote
+    def commit(self):
+        pass
+
+    @remote
+    def rollback(self):
+        pass
+
+    @remote
+    def isClosed(self) -> bool:
+        return self.closed
+
+    @remote
+    def close(self):
+        self.closed = True
+
+class DataSource:
+    def __init__(self, table, batch_updates: bool):
+        self.table = table
+        self.batch_updates = batch_updates
+
+    @remote
+    def getConnection(self, username: str, password: str):
+        return Connection(self.table, self.batch_updates)
+
+class BaseDoc:
+    # batch_updates=False behaves like embedded Firebird, which has no batch support
+    def __init__(self, columns, rows, batch_updates: bool = True):
+        self.data_source = DataSource((columns, list(rows)), batch_updates)
+
+    @remote
+    def getDataSource(self):
+        return self.data_source
+
+    def close_doc(self):
+        pass
+
+# Module installation
+
+class Anything:
+    # Stand-in for enums and helper classes the benchmarked tools never touch
+    def __getattr__(self, name):
+        return Anything()
+
+    def __call__(self, *args, **kwargs):
+        return Anything()
+
+def install():
+    # Registers the fake ooodev/uno modules; must run before libreoffice is imported
+    modules = {
+        "uno": {"systemPathToFileUrl": lambda path: f"file://{path}"},
+        "com": {},
+        "com.sun": {},
+        "com.sun.star": {},
+        "com.sun.star.beans": {"PropertyValue": PropertyValue},
+        "com.sun.star.table": {"CellAddress": CellAddress, "CellRangeAddress": CellRangeAddress},
+        "com.sun.star.sheet": {},
+        "com.sun.star.sheet.ConditionOperator": {"FORMULA": "FORMULA"},
+        "com.sun.star.sdbc": {},
+        "com.sun.star.sdbc.DataType": {"VARCHAR": 12},
+        "com.sun.star.util": {"SortField": SortField},
+        "ooodev": {},
+        "ooodev.loader": {"Lo": Anything()},
+        "ooodev.loader.inst": {},
+        "ooodev.loader.inst.options": {"Options": Anything()},
+        "ooodev.calc": {"CalcDoc": CalcDoc},
+        "ooodev.office": {},
+        "ooodev.office.chart2": {"Chart2": Anything()},
+        "ooodev.write": {"WriteDoc": WriteDoc},
+        "ooodev.draw": {"DrawDoc": DrawDoc},
+        "ooodev.utils": {},
+        "ooodev.utils.kind": {},
+        "ooodev.utils.kind.chart2_types": {"ChartTypes": Anything()},
+        "ooodev.utils.kind.zoom_kind": {"ZoomKind": Anything()},
+        "ooodev.utils.color": {"StandardColor": Anything()},
+        "ooodev.units": {"UnitMM": Anything()},
+        "ooodev.form": {},
+        "ooodev.form.forms": {"Forms": Anything()}
+    }
+    for name, attrs in modules.items():
+        module = types.ModuleType(name)
+        module.__path__ = []
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
@@ -0,0 +1,53 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from libreoffice import AppContext, CalcDoc, WriteDoc, load_document
+
+DOC_CLASSES = {
+    ".ods": CalcDoc,
+    ".xlsx": CalcDoc,
+    ".xls": CalcDoc,
+    ".odt": WriteDoc,
+    ".docx": WriteDoc
+}
+
+def time_loads(worker, path: str, doc_class, mode: str, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        doc = load_document(worker, path, doc_class, mode)
+        timings.append(time.perf_counter() - started)
+        doc.close_doc()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare open_document load times in edit and read mode")
+    parser.add_argument("files", nargs="+", help="ODS/XLSX/ODT/DOCX files to load")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    app_ctx = AppContext()
+    app_ctx.start_office()
+    try:
+        worker = app_ctx.workers[0]
+        for path in args.files:
+            doc_class = DOC_CLASSES.get(os.path.splitext(path)[1].lower())
+            if doc_class is None:
+                print(f"{path}: skipped, unsupported extension")
+                continue
+            # Warm up the office so the first measured load does not pay for filter initialisation
+            load_document(worker, path, doc_class, "read").close_doc()
+            edit = statistics.median(time_loads(worker, path, doc_class, "edit", args.repeats))
+            read = statistics.median(time_loads(worker, path, doc_class, "read", args.repeats))
+            print(f"{path}: edit {edit:.3f}s, read {read:.3f}s, speedup {edit / read:.2f}x (median of {args.repeats})")
+    finally:
+        app_ctx.executor.shutdown()
+        app_ctx.close_office()
+
+if __name__ == "__main__":
+    main()
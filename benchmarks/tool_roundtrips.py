@@ -0,0 +1,152 @@
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fake_office
+
+fake_office.install()
+os.environ.setdefault("LIBREOFFICE_OUTPUT_DIR", tempfile.mkdtemp(prefix="mcp-bench-"))
+
+import libreoffice
+
+# Sheet parse timings from mode="python" documents would interleave with the table
+logging.getLogger(libreoffice.__name__).setLevel(logging.WARNING)
+
+COLUMNS = 10
+
+def calc_doc(size: int):
+    doc = fake_office.CalcDoc()
+    doc.fill("Sheet1", size, COLUMNS)
+    return doc
+
+def writer_doc(size: int):
+    return fake_office.WriteDoc([f"Paragraph {i} " + "lorem ipsum " * 5 for i in range(size)])
+
+def base_doc(size: int):
+    return fake_office.BaseDoc(["id", "name", "value"], [(i, f"row {i}", i * 1.5) for i in range(size)])
+
+def base_doc_without_batch(size: int):
+    return fake_office.BaseDoc(["id", "name", "value"], [(i, f"row {i}", i * 1.5) for i in range(size)], batch_updates=False)
+
+def xlsx_reader(size: int):
+    # A file opened with mode="python"; reads are served from the parsed XML without touching the office
+    path = os.path.join(os.environ["LIBREOFFICE_OUTPUT_DIR"], f"bench_{size}.xlsx")
+    rows = "".join(
+        f'<row r="{row + 1}">' + "".join(f"<c><v>{row * COLUMNS + col}</v></c>" for col in range(COLUMNS)) + "</row>"
+        for row in range(size)
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", f'<workbook xmlns="{libreoffice.XLSX_MAIN}" xmlns:r="{libreoffice.XLSX_RELS}"><sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        archive.writestr("xl/_rels/workbook.xml.rels", f'<Relationships xmlns="{libreoffice.PACKAGE_RELS}"><Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>')
+        archive.writestr("xl/worksheets/sheet1.xml", f'<worksheet xmlns="{libreoffice.XLSX_MAIN}"><sheetData>{rows}</sheetData></worksheet>')
+    return libreoffice.SpreadsheetReader(path)
+
+def batch_operations(n: int):
+    return [
+        {"tool": "set_range_values", "args": {"sheet_name": "Sheet1", "start_cell": "A1", "values": [[float(c) for c in range(COLUMNS)]] * n}},
+        {"tool": "format_cell_range", "args": {"sheet_name": "Sheet1", "range_address": f"A1:J{n}", "bold": True}},
+        {"tool": "sort_range", "args": {"sheet_name": "Sheet1", "range_address": f"A1:J{n}", "sort_column": 0, "ascending": False}},
+        {"tool": "get_range_values", "args": {"sheet_name": "Sheet1", "range_address": f"A1:J{n}"}}
+    ]
+
+# name, document factory, expected growth of round trips with size, tool arguments for a given size.
+# Writer scenarios warm the paragraph index first, so they measure the steady state.
+SCENARIOS = [
+    ("get_sheet_names", calc_doc, "constant", lambda n: {}),
+    ("get_cell_value", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "cell_address": f"J{n}"}),
+    ("set_cell_value", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "cell_address": f"J{n}", "value": "42"}),
+    ("get_range_values", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "range_address": f"A1:J{n}"}),
+    ("set_range_values", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "start_cell": "A1", "values": [[float(c) for c in range(COLUMNS)]] * n}),
+    ("calculate_statistics", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "range_address": f"A1:J{n}"}),
+    ("conditional_format", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "range_address": f"A1:J{n}", "threshold": n * COLUMNS / 2}),
+    ("format_cell_range", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "range_address": f"A1:J{n}", "bold": True, "italic": True}),
+    ("sort_range", calc_doc, "constant", lambda n: {"sheet_name": "Sheet1", "range_address": f"A1:J{n}", "sort_column": 0, "ascending": False}),
+    ("execute_batch", calc_doc, "constant", lambda n: {"operations": batch_operations(n)}),
+    ("get_sheet_names", xlsx_reader, "constant", lambda n: {}),
+    ("get_cell_value", xlsx_reader, "constant", lambda n: {"sheet_name": "Sheet1", "cell_address": f"J{n}"}),
+    ("get_range_values", xlsx_reader, "constant", lambda n: {"sheet_name": "Sheet1", "range_address": f"A1:J{n}"}),
+    ("calculate_statistics", xlsx_reader, "constant", lambda n: {"sheet_name": "Sheet1", "range_address": f"A1:J{n}"}),
+    ("insert_text", writer_doc, "constant", lambda n: {"text": "x", "position": 5}),
+    ("apply_style", writer_doc, "constant", lambda n: {"style_name": "Heading 1", "start": 0, "end": 5}),
+    ("run_query", base_doc, "linear", lambda n: {"sql": "SELECT * FROM items"}),
+    ("run_query", base_doc, "constant", lambda n: {"sql": "SELECT * FROM items", "page_size": 5}),
+    ("list_tables", base_doc, "constant", lambda n: {}),
+    ("insert_data", base_doc, "constant", lambda n: {"table_name": "items", "data": {"id": n, "name": "new", "value": 1.5}}),
+    ("insert_rows", base_doc, "linear", lambda n: {"table_name": "items", "columns": ["id", "name", "value"], "rows": [[i, f"row {i}", i * 1.5] for i in range(n)]}),
+    ("insert_rows", base_doc_without_batch, "linear", lambda n: {"table_name": "items", "columns": ["id", "name", "value"], "rows": [[i, f"row {i}", i * 1.5] for i in range(n)]})
+]
+
+def run_scenario(app_ctx, name: str, factory, size: int, kwargs, repeats: int):
+    ctx = types.SimpleNamespace(request_context=types.SimpleNamespace(lifespan_context=app_ctx))
+    tool = libreoffice.TOOLS[name]
+    doc = factory(size)
+    if isinstance(doc, libreoffice.SpreadsheetReader):
+        doc_id = app_ctx.register_document(doc, None, doc.path)
+    else:
+        doc_id = app_ctx.register_document(doc, app_ctx.workers[0])
+    try:
+        if factory is writer_doc:
+            app_ctx.get_text_index(doc_id, app_ctx.get_document(doc_id))
+        timings = []
+        trips = []
+        calls = None
+        for _ in range(repeats):
+            fake_office.BRIDGE.reset()
+            started = time.perf_counter()
+            tool(ctx, doc_id=doc_id, **kwargs)
+            timings.append(time.perf_counter() - started)
+            trips.append(fake_office.BRIDGE.total)
+            calls = fake_office.BRIDGE.calls.copy()
+            for cursor in [c for c in list(app_ctx.cursors.values()) if c.doc_id == doc_id]:
+                app_ctx.close_cursor(cursor.cursor_id)
+        return statistics.median(timings), max(trips), calls
+    finally:
+        app_ctx.close_document(doc_id)
+
+def main():
+    parser = argparse.ArgumentParser(description="Count UNO round trips and time every benchmarked tool against an in-process fake office")
+    parser.add_argument("--sizes", default="10,100,1000", help="Comma-separated data sizes (rows, paragraphs or result rows)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency charged for every simulated bridge call")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--tools", default="", help="Comma-separated subset of tools to run")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero when a constant-cost tool makes more round trips as the data grows")
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    selected = {tool.strip() for tool in args.tools.split(",") if tool.strip()}
+    fake_office.BRIDGE.latency = args.latency_ms / 1000
+
+    app_ctx = libreoffice.AppContext()
+    app_ctx.workers = [libreoffice.OfficeWorker(0, 0)]
+    regressions = []
+    try:
+        for name, factory, growth, make_kwargs in SCENARIOS:
+            if selected and name not in selected:
+                continue
+            label = f"{factory.__name__}: {name}({', '.join(f'{key}=' for key in make_kwargs(1))})"
+            per_size = []
+            for size in sizes:
+                elapsed, trips, calls = run_scenario(app_ctx, name, factory, size, make_kwargs(size), args.repeats)
+                per_size.append(trips)
+                top = ", ".join(f"{call} x{count}" for call, count in calls.most_common(3))
+                print(f"{label:<76} n={size:<7} {trips:>7} round trips {elapsed * 1000:>9.3f} ms  [{top}]")
+            if growth == "constant" and per_size[-1] > per_size[0]:
+                regressions.append(f"{label}: {per_size[0]} round trips at n={sizes[0]}, {per_size[-1]} at n={sizes[-1]}")
+    finally:
+        app_ctx.executor.shutdown()
+    if regressions:
+        print("\nRound trips grow with data size:")
+        for line in regressions:
+            print(f"  {line}")
+        if args.check:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
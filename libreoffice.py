@@ -1,8 +1,7 @@
-from typing import List, Dict
+from typing import Any, List, Dict
 from ooodev.loader import Lo
 from ooodev.loader.inst.options import Options
 from ooodev.calc import CalcDoc
-from ooodev.office.write import Write
 from ooodev.write import WriteDoc
 from ooodev.draw import DrawDoc
 from ooodev.office.chart2 import Chart2
@@ -13,55 +12,1888 @@ from ooodev.form.forms import Forms
 from ooodev.utils.color import StandardColor
 from mcp.server.fastmcp import FastMCP, Context
 from fastapi import FastAPI, Request
-from contextlib import asynccontextmanager
+from fastapi.responses import JSONResponse, PlainTextResponse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+import asyncio
+import base64
+import bisect
+import collections
+import csv
+import datetime
+import functools
+import glob
+import hashlib
+import io
+import json
 import logging
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+import warnings
+import numpy as np
+import uno
 from dotenv import load_dotenv
 import os
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+def parse_cell_address(cell_address: str):
+    match = re.fullmatch(r"\$?([A-Za-z]+)\$?(\d+)", cell_address.strip())
+    if not match:
+        raise RuntimeError(f"Invalid cell address '{cell_address}'")
+    col = 0
+    for ch in match.group(1).upper():
+        col = col * 26 + (ord(ch) - ord("A") + 1)
+    return col - 1, int(match.group(2)) - 1
+
+def column_name(col: int) -> str:
+    name = ""
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        name = chr(ord("A") + rem) + name
+    return name
+
+def parse_numeric(value):
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    # setDataArray only accepts doubles and strings; bools and ints beyond 32 bits fail the whole write
+    if isinstance(value, (bool, int)):
+        return float(value)
+    if isinstance(value, float):
+        return value
+    return str(value)
+
+def make_props(**kwargs):
+    from com.sun.star.beans import PropertyValue
+    props = []
+    for name, value in kwargs.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        props.append(prop)
+    return tuple(props)
+
+def ensure_cell_style(doc, color: str) -> str:
+    if not re.fullmatch(r"#[0-9A-Fa-f]{6}", color):
+        raise RuntimeError(f"Invalid color '{color}'. Use #RRGGBB")
+    name = f"MCP_Background_{color[1:].upper()}"
+    component = TRACER.wrap(doc.component, "Document")
+    styles = component.getStyleFamilies().getByName("CellStyles")
+    if not styles.hasByName(name):
+        style = component.createInstance("com.sun.star.style.CellStyle")
+        styles.insertByName(name, style)
+        style.setPropertyValue("CellBackColor", int(color[1:], 16))
+    return name
+
+def check_identifier(name: str) -> str:
+    if not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*|"[^"]+"', name):
+        raise RuntimeError(f"Invalid SQL identifier '{name}'")
+    return name
+
+def bind_parameter(statement, index: int, value):
+    from com.sun.star.sdbc.DataType import VARCHAR
+    if value is None:
+        statement.setNull(index, VARCHAR)
+    elif isinstance(value, bool):
+        statement.setBoolean(index, value)
+    elif isinstance(value, int):
+        statement.setLong(index, value)
+    elif isinstance(value, float):
+        statement.setDouble(index, value)
+    else:
+        statement.setString(index, str(value))
+
+# Update-count sentinels executeBatch returns, as in JDBC: ran without a row count, and failed
+BATCH_SUCCESS_NO_INFO = -2
+BATCH_EXECUTE_FAILED = -3
+
+DEFAULT_DOCUMENT_SIZE = 1024 * 1024
+
+def default_extension(doc) -> str:
+    if isinstance(doc, CalcDoc):
+        return "ods"
+    if isinstance(doc, WriteDoc):
+        return "odt"
+    if isinstance(doc, DrawDoc):
+        return "odg"
+    return "odb"
+
+def save_atomically(doc, target: str, tag: str):
+    # Write next to the target under a temporary name with the same extension (it selects the
+    # export filter), then rename so readers never observe a partially written file
+    directory, name = os.path.split(target)
+    stem, ext = os.path.splitext(name)
+    temp_path = os.path.join(directory, f".{stem}.{tag}.tmp{ext}")
+    try:
+        with TRACER.span(f"{type(doc).__name__}.save_doc"):
+            doc.save_doc(fnm=temp_path)
+        os.replace(temp_path, target)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def place_file(source: str, target: str, link: bool = False):
+    # A hardlink shares the cache entry with the output file, so anything editing that file in place
+    # would corrupt the entry; it is only used when explicitly enabled
+    temp_path = f"{target}.{uuid.uuid4().hex}.tmp"
+    try:
+        if link:
+            try:
+                os.link(source, temp_path)
+            except OSError:
+                link = False
+        if not link:
+            shutil.copyfile(source, temp_path)
+        os.replace(temp_path, target)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ExportCache:
+    def __init__(self, directory: str, max_bytes: int, hardlink: bool = False):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hardlink = hardlink
+        self.lock = threading.Lock()
+        self.digests = {}
+        # Hits are recorded here rather than with os.utime, which would also touch hardlinked exports
+        self.last_used = {}
+        if max_bytes > 0:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def source_digest(self, path: str) -> str:
+        stat = os.stat(path)
+        key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        digest = self.digests.get(key)
+        if digest is None:
+            digest = file_digest(path)
+            self.digests[key] = digest
+        return digest
+
+    def entry_path(self, key: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{key}{ext.lower()}")
+
+    def fetch(self, key: str, ext: str, target: str) -> bool:
+        if not self.enabled:
+            return False
+        cached = self.entry_path(key, ext)
+        with self.lock:
+            if not os.path.isfile(cached):
+                return False
+            self.last_used[cached] = time.time()
+            place_file(cached, target, self.hardlink)
+        return True
+
+    def store(self, key: str, ext: str, source: str):
+        if not self.enabled or os.path.getsize(source) > self.max_bytes:
+            return
+        with self.lock:
+            cached = self.entry_path(key, ext)
+            place_file(source, cached, self.hardlink)
+            self.last_used[cached] = time.time()
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    entries.append((max(stat.st_mtime, self.last_used.get(entry.path, 0)), stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                self.last_used.pop(path, None)
+                total -= size
+
+@contextmanager
+def bulk_update(doc):
+    # Lock views and suspend auto-calc so a bulk write pays for a single recalculation
+    component = TRACER.wrap(doc.component, "Document")
+    component.lockControllers()
+    auto_calc = component.isAutomaticCalculationEnabled()
+    component.enableAutomaticCalculation(False)
+    try:
+        yield component
+    finally:
+        component.enableAutomaticCalculation(auto_calc)
+        component.unlockControllers()
+
+class OfficeWorker:
+    def __init__(self, index: int, port: int, pipe_name: str | None = None, profile_dir: str | None = None):
+        # With a pipe_name the worker talks to soffice over a named pipe instead of the TCP port
+        self.index = index
+        self.port = port
+        self.pipe_name = pipe_name
+        self.profile_dir = profile_dir
+        self.loader = None
+        self.lo_inst = None
+        self.doc_ids = set()
+        self.load_lock = threading.Lock()
+        self.recalc_config = None
+        self.process = None
+        self.healthy = False
+        self.failures = 0
+        self.restarts = 0
+        self.last_ping = None
+        # Watchdog futures; a ping or restart stuck in a hung bridge keeps its thread until the office dies
+        self.pending_ping = None
+        self.pending_restart = None
+
+    @property
+    def address(self) -> str:
+        return f"pipe {self.pipe_name}" if self.pipe_name else f"port {self.port}"
+
+    @property
+    def usable(self) -> bool:
+        # A killed worker, or one the watchdog gave up on, must not be handed new work
+        return self.healthy and self.loader is not None
+
+    def spawn(self, binary: str):
+        accept = f"pipe,name={self.pipe_name};urp;" if self.pipe_name else f"socket,host=localhost,port={self.port};urp;"
+        command = [binary, "--headless", "--invisible", "--nologo", "--norestore", "--nodefault", f"--accept={accept}"]
+        if self.profile_dir:
+            # A private user profile keeps workers from sharing (and locking) the default one
+            os.makedirs(self.profile_dir, exist_ok=True)
+            stale_lock = os.path.join(self.profile_dir, ".lock")
+            if os.path.exists(stale_lock):
+                os.remove(stale_lock)
+            command.insert(1, f"-env:UserInstallation={uno.systemPathToFileUrl(os.path.abspath(self.profile_dir))}")
+        self.process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        logger.info(f"Started soffice (pid {self.process.pid}) for worker {self.index} on {self.address}")
+
+    def connect_when_ready(self, timeout: float):
+        # A freshly spawned soffice takes a few seconds before it accepts connections
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.connect()
+            except Exception:
+                if self.process is not None and self.process.poll() is not None:
+                    raise RuntimeError(f"soffice exited with code {self.process.returncode}")
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.5)
+
+    def connect(self):
+        if self.pipe_name:
+            connector = Lo.ConnectPipe(pipe=self.pipe_name)
+        else:
+            connector = Lo.ConnectSocket(host="localhost", port=self.port)
+        opt = Options(log_level="INFO")
+        if self.index == 0:
+            self.loader = Lo.load_office(connector=connector, opt=opt)
+            self.lo_inst = Lo.current_lo
+        else:
+            self.lo_inst = Lo.create_lo_instance(connector=connector, opt=opt)
+            self.loader = self.lo_inst.loader_current
+        self.recalc_config = None
+        self.healthy = True
+        self.failures = 0
+        self.pending_ping = None
+        return self.loader
+
+    def ping(self) -> float:
+        if self.loader is None:
+            raise RuntimeError("Not connected")
+        started = time.perf_counter()
+        self.loader.getComponents()
+        return time.perf_counter() - started
+
+    def kill(self):
+        # The bridge is dead or hung, so it is dropped without calling into it
+        self.healthy = False
+        self.loader = None
+        self.lo_inst = None
+        self.recalc_config = None
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait(timeout=30)
+            self.process = None
+
+    def set_recalc_on_load(self, ooxml: int, odf: int):
+        if self.recalc_config is None:
+            from com.sun.star.lang import XMultiServiceFactory
+            provider = self.lo_inst.create_instance_mcf(XMultiServiceFactory, "com.sun.star.configuration.ConfigurationProvider", raise_err=True)
+            self.recalc_config = provider.createInstanceWithArguments(
+                "com.sun.star.configuration.ConfigurationUpdateAccess",
+                make_props(nodepath="/org.openoffice.Office.Calc/Formula/Load")
+            )
+        previous = (self.recalc_config.getPropertyValue("OOXMLRecalcMode"), self.recalc_config.getPropertyValue("ODFRecalcMode"))
+        self.recalc_config.setPropertyValue("OOXMLRecalcMode", ooxml)
+        self.recalc_config.setPropertyValue("ODFRecalcMode", odf)
+        self.recalc_config.commitChanges()
+        return previous
+
+    def close(self):
+        if self.loader is not None:
+            try:
+                if self.index == 0:
+                    Lo.close_office()
+                else:
+                    self.lo_inst.close_office()
+            finally:
+                self.loader = None
+                self.lo_inst = None
+                self.recalc_config = None
+                self.healthy = False
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+RECALC_NEVER = 1
+
+EXPORT_FILTERS = {
+    "pdf": {"writer": "writer_pdf_Export", "calc": "calc_pdf_Export", "impress": "impress_pdf_Export", "draw": "draw_pdf_Export"},
+    "odt": {"writer": "writer8"},
+    "ods": {"calc": "calc8"},
+    "odp": {"impress": "impress8"},
+    "odg": {"draw": "draw8"},
+    "docx": {"writer": "MS Word 2007 XML"},
+    "xlsx": {"calc": "Calc MS Excel 2007 XML"},
+    "pptx": {"impress": "Impress MS PowerPoint 2007 XML"},
+    "html": {"writer": "HTML (StarWriter)", "calc": "HTML (StarCalc)"},
+    "csv": {"calc": "Text - txt - csv (StarCalc)"}
+}
+
+NATIVE_FILTERS = {"writer": "writer8", "calc": "calc8", "impress": "impress8", "draw": "draw8"}
+
+def component_kind(component) -> str:
+    if component.supportsService("com.sun.star.sheet.SpreadsheetDocument"):
+        return "calc"
+    if component.supportsService("com.sun.star.text.TextDocument"):
+        return "writer"
+    if component.supportsService("com.sun.star.presentation.PresentationDocument"):
+        return "impress"
+    if component.supportsService("com.sun.star.drawing.DrawingDocument"):
+        return "draw"
+    raise RuntimeError("Unsupported document kind")
+
+def convert_file(worker: OfficeWorker, source: str, target: str, target_format: str, filter_name: str = "") -> Dict[str, Any]:
+    started = time.perf_counter()
+    with worker.load_lock:
+        component = worker.loader.loadComponentFromURL(
+            uno.systemPathToFileUrl(source), "_blank", 0, make_props(Hidden=True, ReadOnly=True)
+        )
+    if component is None:
+        raise RuntimeError(f"Could not load {source}")
+    try:
+        if not filter_name:
+            kind = component_kind(component)
+            filter_name = EXPORT_FILTERS.get(target_format, {}).get(kind)
+            if not filter_name:
+                raise RuntimeError(f"No {target_format} export filter for {kind} documents")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        stem, ext = os.path.splitext(os.path.basename(target))
+        temp_path = os.path.join(os.path.dirname(target), f".{stem}.{worker.index}.tmp{ext}")
+        try:
+            component.storeToURL(uno.systemPathToFileUrl(temp_path), make_props(FilterName=filter_name, Overwrite=True))
+            os.replace(temp_path, target)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    finally:
+        component.close(True)
+    return {"filter": filter_name, "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+def load_document(worker: OfficeWorker, path: str, doc_class, mode: str = "edit"):
+    # "read" loads hidden and read-only, skips the recalculation on load and locks the undo manager
+    if mode == "edit":
+        with worker.load_lock, TRACER.span(f"{doc_class.__name__}.from_path"):
+            return doc_class.from_path(fnm=path, lo_inst=worker.lo_inst)
+    if mode != "read":
+        raise RuntimeError("Invalid mode. Use: edit, read")
+    url = uno.systemPathToFileUrl(os.path.abspath(path))
+    props = make_props(Hidden=True, ReadOnly=True)
+    with worker.load_lock:
+        previous = worker.set_recalc_on_load(RECALC_NEVER, RECALC_NEVER) if doc_class is CalcDoc else None
+        try:
+            with TRACER.span("Loader.loadComponentFromURL"):
+                component = worker.loader.loadComponentFromURL(url, "_blank", 0, props)
+        finally:
+            if previous is not None:
+                worker.set_recalc_on_load(*previous)
+    if component is None:
+        raise RuntimeError(f"Could not load {path}")
+    try:
+        component.getUndoManager().lock()
+    except AttributeError:
+        pass
+    return doc_class(doc=component, lo_inst=worker.lo_inst)
+
+ODS_TABLE = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+ODS_OFFICE = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+ODS_TEXT = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+XLSX_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_RELS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+SPREADSHEET_EPOCH = datetime.datetime(1899, 12, 30)
+
+class RecalcRequired(Exception):
+    pass
+
+def date_serial(value: str) -> float:
+    moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is not None:
+        moment = moment.replace(tzinfo=None)
+    return (moment - SPREADSHEET_EPOCH).total_seconds() / 86400
+
+def duration_days(value: str) -> float:
+    match = re.fullmatch(r"(-)?P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:([\d.]+)S)?)?", value)
+    if not match:
+        raise RuntimeError(f"Invalid duration '{value}'")
+    sign, days, hours, minutes, seconds = match.groups()
+    total = int(days or 0) + int(hours or 0) / 24 + int(minutes or 0) / 1440 + float(seconds or 0) / 86400
+    return -total if sign else total
+
+class SpreadsheetReader:
+    # Read-only view of an ODS/XLSX file parsed in Python; sheets are parsed on first use and
+    # keep the values cached in the file, so nothing is recalculated
+    def __init__(self, path: str):
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in (".ods", ".xlsx", ".xlsm"):
+            raise RuntimeError("Python mode supports .ods, .xlsx and .xlsm files")
+        if not zipfile.is_zipfile(path):
+            raise RuntimeError(f"{path} is not a valid {ext[1:]} file")
+        self.path = path
+        self.kind = "ods" if ext == ".ods" else "xlsx"
+        self.names = None
+        self.sheets = {}
+        self.sheet_parts = None
+        self.shared_strings = None
+        self.lock = threading.Lock()
+
+    def close_doc(self):
+        self.sheets.clear()
+
+    def sheet_names(self) -> List[str]:
+        with self.lock:
+            if self.names is None:
+                self.names = self.ods_sheet_names() if self.kind == "ods" else list(self.xlsx_sheet_parts())
+            return list(self.names)
+
+    def sheet(self, name: str):
+        if name not in self.sheet_names():
+            raise RuntimeError(f"Sheet '{name}' not found")
+        with self.lock:
+            if name not in self.sheets:
+                started = time.perf_counter()
+                self.sheets[name] = self.parse_ods_sheet(name) if self.kind == "ods" else self.parse_xlsx_sheet(name)
+                logger.info(f"Parsed sheet '{name}' of {self.path} in {(time.perf_counter() - started) * 1000:.1f} ms")
+            return self.sheets[name]
+
+    def get_range(self, name: str, range_address: str):
+        start, _, end = range_address.rpartition(".")[2].partition(":")
+        first_col, first_row = parse_cell_address(start)
+        last_col, last_row = parse_cell_address(end or start)
+        first_col, last_col = sorted((first_col, last_col))
+        first_row, last_row = sorted((first_row, last_row))
+        cells, uncached = self.sheet(name)
+        if any(first_row <= row <= last_row and first_col <= col <= last_col for row, col in uncached):
+            raise RecalcRequired(f"{range_address} contains formulas without cached results")
+        return tuple(
+            tuple(cells.get((row, col), "") for col in range(first_col, last_col + 1))
+            for row in range(first_row, last_row + 1)
+        )
+
+    def ods_sheet_names(self) -> List[str]:
+        names = []
+        with zipfile.ZipFile(self.path) as archive, archive.open("content.xml") as content:
+            for event, elem in self.ods_events(content):
+                if event == "start" and elem.tag == f"{{{ODS_TABLE}}}table":
+                    names.append(elem.get(f"{{{ODS_TABLE}}}name"))
+        return names
+
+    def ods_events(self, content):
+        # Rows are dropped as soon as they are parsed so memory stays flat on large sheets
+        parents = []
+        for event, elem in ET.iterparse(content, events=("start", "end")):
+            if event == "start":
+                parents.append(elem)
+                yield event, elem
+                continue
+            parents.pop()
+            yield event, elem
+            if elem.tag == f"{{{ODS_TABLE}}}table-row":
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+
+    def parse_ods_sheet(self, name: str):
+        cells, uncached = {}, set()
+        in_sheet = False
+        row = 0
+        with zipfile.ZipFile(self.path) as archive, archive.open("content.xml") as content:
+            for event, elem in self.ods_events(content):
+                if elem.tag == f"{{{ODS_TABLE}}}table":
+                    if event == "start" and elem.get(f"{{{ODS_TABLE}}}name") == name:
+                        in_sheet = True
+                    elif event == "end" and in_sheet:
+                        break
+                if event != "end" or not in_sheet or elem.tag != f"{{{ODS_TABLE}}}table-row":
+                    continue
+                repeat = int(elem.get(f"{{{ODS_TABLE}}}number-rows-repeated", "1"))
+                row_cells = self.ods_row(elem)
+                # Trailing empty rows are typically repeated up to the sheet limit, so only
+                # rows with content are expanded
+                for offset in range(repeat if row_cells else 0):
+                    for col, value, cached in row_cells:
+                        if cached:
+                            cells[(row + offset, col)] = value
+                        else:
+                            uncached.add((row + offset, col))
+                row += repeat
+        return cells, uncached
+
+    def ods_row(self, row):
+        values = []
+        col = 0
+        for cell in row:
+            if cell.tag not in (f"{{{ODS_TABLE}}}table-cell", f"{{{ODS_TABLE}}}covered-table-cell"):
+                continue
+            repeat = int(cell.get(f"{{{ODS_TABLE}}}number-columns-repeated", "1"))
+            value_type = cell.get(f"{{{ODS_OFFICE}}}value-type")
+            if value_type is None:
+                if cell.get(f"{{{ODS_TABLE}}}formula") is not None:
+                    values.extend((c, "", False) for c in range(col, col + repeat))
+            else:
+                value = self.ods_value(cell, value_type)
+                values.extend((c, value, True) for c in range(col, col + repeat))
+            col += repeat
+        return values
+
+    def ods_value(self, cell, value_type: str):
+        if value_type in ("float", "percentage", "currency"):
+            return float(cell.get(f"{{{ODS_OFFICE}}}value"))
+        if value_type == "boolean":
+            return 1.0 if cell.get(f"{{{ODS_OFFICE}}}boolean-value") == "true" else 0.0
+        if value_type == "date":
+            return date_serial(cell.get(f"{{{ODS_OFFICE}}}date-value"))
+        if value_type == "time":
+            return duration_days(cell.get(f"{{{ODS_OFFICE}}}time-value"))
+        value = cell.get(f"{{{ODS_OFFICE}}}string-value")
+        if value is None:
+            # Only direct paragraphs; an office:annotation child has paragraphs of its own
+            value = "\n".join(self.ods_text(p) for p in cell.findall(f"{{{ODS_TEXT}}}p"))
+        return value
+
+    def ods_text(self, elem) -> str:
+        # Runs of spaces, tabs and line breaks are stored as elements rather than characters
+        parts = [elem.text or ""]
+        for child in elem:
+            if child.tag == f"{{{ODS_TEXT}}}s":
+                parts.append(" " * int(child.get(f"{{{ODS_TEXT}}}c", "1")))
+            elif child.tag == f"{{{ODS_TEXT}}}tab":
+                parts.append("\t")
+            elif child.tag == f"{{{ODS_TEXT}}}line-break":
+                parts.append("\n")
+            elif child.tag != f"{{{ODS_OFFICE}}}annotation":
+                parts.append(self.ods_text(child))
+            parts.append(child.tail or "")
+        return "".join(parts)
+
+    def xlsx_sheet_parts(self) -> Dict[str, str]:
+        if self.sheet_parts is None:
+            with zipfile.ZipFile(self.path) as archive:
+                rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+                targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{{{PACKAGE_RELS}}}Relationship")}
+                workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+                parts = {}
+                for sheet in workbook.iter(f"{{{XLSX_MAIN}}}sheet"):
+                    target = targets[sheet.get(f"{{{XLSX_RELS}}}id")]
+                    parts[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            self.sheet_parts = parts
+        return self.sheet_parts
+
+    def xlsx_strings(self, archive) -> List[str]:
+        if self.shared_strings is None:
+            strings = []
+            if "xl/sharedStrings.xml" in archive.namelist():
+                with archive.open("xl/sharedStrings.xml") as part:
+                    for _, elem in ET.iterparse(part):
+                        if elem.tag == f"{{{XLSX_MAIN}}}si":
+                            strings.append(self.xlsx_text(elem))
+                            elem.clear()
+            self.shared_strings = strings
+        return self.shared_strings
+
+    def xlsx_text(self, elem) -> str:
+        # Plain <t> or rich text runs <r><t>; phonetic hints (<rPh>) are not part of the value
+        parts = []
+        for child in elem:
+            if child.tag == f"{{{XLSX_MAIN}}}t":
+                parts.append(child.text or "")
+            elif child.tag == f"{{{XLSX_MAIN}}}r":
+                parts.extend(t.text or "" for t in child.iter(f"{{{XLSX_MAIN}}}t"))
+        return "".join(parts)
+
+    def parse_xlsx_sheet(self, name: str):
+        cells, uncached = {}, set()
+        sheet_data = None
+        row = -1
+        next_col = 0
+        with zipfile.ZipFile(self.path) as archive:
+            part = self.xlsx_sheet_parts()[name]
+            with archive.open(part) as content:
+                for event, elem in ET.iterparse(content, events=("start", "end")):
+                    if event == "start":
+                        if elem.tag == f"{{{XLSX_MAIN}}}sheetData":
+                            sheet_data = elem
+                        elif elem.tag == f"{{{XLSX_MAIN}}}row":
+                            row = int(elem.get("r")) - 1 if elem.get("r") else row + 1
+                            next_col = 0
+                        continue
+                    if elem.tag == f"{{{XLSX_MAIN}}}row":
+                        elem.clear()
+                        if sheet_data is not None:
+                            sheet_data.remove(elem)
+                        continue
+                    if elem.tag != f"{{{XLSX_MAIN}}}c":
+                        continue
+                    col = parse_cell_address(elem.get("r"))[0] if elem.get("r") else next_col
+                    next_col = col + 1
+                    cell_type = elem.get("t", "n")
+                    value = elem.find(f"{{{XLSX_MAIN}}}v")
+                    if cell_type == "inlineStr":
+                        inline = elem.find(f"{{{XLSX_MAIN}}}is")
+                        cells[(row, col)] = self.xlsx_text(inline) if inline is not None else ""
+                    elif value is None or value.text is None:
+                        if elem.find(f"{{{XLSX_MAIN}}}f") is not None:
+                            uncached.add((row, col))
+                    elif cell_type == "s":
+                        cells[(row, col)] = self.xlsx_strings(archive)[int(value.text)]
+                    elif cell_type == "b":
+                        cells[(row, col)] = 1.0 if value.text == "1" else 0.0
+                    elif cell_type in ("str", "e"):
+                        cells[(row, col)] = value.text
+                    elif cell_type == "d":
+                        cells[(row, col)] = date_serial(value.text)
+                    else:
+                        cells[(row, col)] = float(value.text)
+        return cells, uncached
+
+PREWARM_FACTORIES = {
+    "writer": ("swriter", WriteDoc),
+    "calc": ("scalc", CalcDoc),
+    "draw": ("sdraw", DrawDoc),
+    "impress": ("simpress", DrawDoc)
+}
+
+def create_blank_document(worker: OfficeWorker, doc_type: str):
+    # Pre-warmed and on-demand documents come from here alike, so new_document returns the same
+    # kind of document whether or not the pool had one; "impress" is a presentation, not a drawing
+    factory, doc_class = PREWARM_FACTORIES[doc_type]
+    with TRACER.span("Loader.loadComponentFromURL"):
+        component = worker.loader.loadComponentFromURL(f"private:factory/{factory}", "_blank", 0, make_props())
+    if component is None:
+        raise RuntimeError(f"The office could not create a {doc_type} document")
+    return doc_class(doc=component, lo_inst=worker.lo_inst)
+
+def parse_pool_sizes(spec: str) -> Dict[str, int]:
+    sizes = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        doc_type, _, count = item.partition("=")
+        doc_type = doc_type.strip()
+        if doc_type not in PREWARM_FACTORIES:
+            raise RuntimeError(f"Invalid pre-warm document type '{doc_type}'. Use: {', '.join(PREWARM_FACTORIES.keys())}")
+        sizes[doc_type] = max(0, int(count or 1))
+    return sizes
+
+class UnoExecutor:
+    def __init__(self, threads: int, max_pending: int):
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="uno")
+        self.max_pending = max_pending
+        self.pending = 0
+        self.doc_locks = {}
+
+    async def submit(self, key, fn, *args, **kwargs):
+        # Calls on the same document stay ordered; calls on different documents may overlap
+        if self.pending >= self.max_pending:
+            raise RuntimeError(f"UNO executor queue is full ({self.max_pending} pending calls), retry later")
+        lock = self.doc_locks.setdefault(key, asyncio.Lock()) if key else nullcontext()
+        self.pending += 1
+        try:
+            async with lock:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def forget(self, key):
+        self.doc_locks.pop(key, None)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+def label_value(value) -> str:
+    # Prometheus text format: backslash, double quote and newline must be escaped inside label values
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def document_kind(doc) -> str:
+    if isinstance(doc, (CalcDoc, SpreadsheetReader)):
+        return "calc"
+    if isinstance(doc, WriteDoc):
+        return "writer"
+    if isinstance(doc, DrawDoc):
+        return "draw"
+    if doc is None:
+        return "none"
+    return "base" if hasattr(doc, "getDataSource") else "other"
+
+class ToolMetrics:
+    # Latency histograms per tool, doc type and outcome, rendered in the Prometheus text format
+    # together with gauges read from the running AppContext
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    # doc_type arguments outside this set are recorded as "invalid" so callers cannot mint new series
+    DOC_TYPES = ("writer", "calc", "draw", "impress", "base")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}
+        self.uno_calls = {}
+        self.app_ctx = None
+
+    def doc_type(self, kwargs) -> str:
+        if kwargs.get("doc_type"):
+            return kwargs["doc_type"] if kwargs["doc_type"] in self.DOC_TYPES else "invalid"
+        doc_id = kwargs.get("doc_id")
+        if not doc_id or self.app_ctx is None:
+            return "none"
+        return document_kind(self.app_ctx.documents.get(doc_id))
+
+    def observe(self, tool: str, doc_type: str, outcome: str, seconds: float):
+        key = (tool, doc_type, outcome)
+        with self.lock:
+            entry = self.series.get(key)
+            if entry is None:
+                entry = self.series[key] = {"buckets": [0] * len(self.BUCKETS), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+            entry["sum"] += seconds
+            entry["count"] += 1
+
+    def observe_uno(self, tool: str, calls: int, seconds: float):
+        with self.lock:
+            entry = self.uno_calls.setdefault(tool, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+
+    @contextmanager
+    def track(self, tool: str, doc_type: str):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            self.observe(tool, doc_type, outcome, time.perf_counter() - started)
+
+    def render(self) -> str:
+        lines = [
+            "# HELP mcp_tool_duration_seconds MCP tool call latency, including time queued for the UNO executor",
+            "# TYPE mcp_tool_duration_seconds histogram"
+        ]
+        with self.lock:
+            series = sorted((key, dict(entry, buckets=list(entry["buckets"]))) for key, entry in self.series.items())
+            uno_series = sorted((tool, tuple(entry)) for tool, entry in self.uno_calls.items())
+        for (tool, doc_type, outcome), entry in series:
+            labels = f'tool="{label_value(tool)}",doc_type="{label_value(doc_type)}",outcome="{label_value(outcome)}"'
+            for bound, count in zip(self.BUCKETS, entry["buckets"]):
+                lines.append(f'mcp_tool_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'mcp_tool_duration_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+            lines.append(f"mcp_tool_duration_seconds_sum{{{labels}}} {entry['sum']:.6f}")
+            lines.append(f"mcp_tool_duration_seconds_count{{{labels}}} {entry['count']}")
+        if uno_series:
+            lines.append("# HELP mcp_uno_calls_total UNO bridge calls made by traced tool calls")
+            lines.append("# TYPE mcp_uno_calls_total counter")
+            for tool, (calls, _) in uno_series:
+                lines.append(f'mcp_uno_calls_total{{tool="{label_value(tool)}"}} {calls}')
+            lines.append("# HELP mcp_uno_seconds_total Time spent in UNO bridge calls by traced tool calls")
+            lines.append("# TYPE mcp_uno_seconds_total counter")
+            for tool, (_, seconds) in uno_series:
+                lines.append(f'mcp_uno_seconds_total{{tool="{label_value(tool)}"}} {seconds:.6f}')
+        lines.append("# HELP mcp_tool_calls_total MCP tool calls by outcome")
+        lines.append("# TYPE mcp_tool_calls_total counter")
+        for (tool, doc_type, outcome), entry in series:
+            lines.append(f'mcp_tool_calls_total{{tool="{label_value(tool)}",doc_type="{label_value(doc_type)}",outcome="{label_value(outcome)}"}} {entry["count"]}')
+        app_ctx = self.app_ctx
+        if app_ctx is not None:
+            with app_ctx.registry_lock:
+                kinds = collections.Counter(document_kind(doc) for doc in app_ctx.documents.values())
+                workers = list(app_ctx.workers)
+                jobs = collections.Counter(job["status"] for job in app_ctx.jobs.values())
+            lines.append("# HELP mcp_open_documents Open document handles by doc type")
+            lines.append("# TYPE mcp_open_documents gauge")
+            for kind, count in sorted(kinds.items()):
+                lines.append(f'mcp_open_documents{{doc_type="{label_value(kind)}"}} {count}')
+            lines.append("# HELP mcp_uno_queue_depth Tool calls waiting for or running on the UNO executor")
+            lines.append("# TYPE mcp_uno_queue_depth gauge")
+            lines.append(f"mcp_uno_queue_depth {app_ctx.executor.pending}")
+            lines.append("# HELP mcp_jobs Asynchronous jobs by status")
+            lines.append("# TYPE mcp_jobs gauge")
+            for status, count in sorted(jobs.items()):
+                lines.append(f'mcp_jobs{{status="{label_value(status)}"}} {count}')
+            lines.append("# HELP mcp_office_connected Whether the office worker is connected and passing health checks")
+            lines.append("# TYPE mcp_office_connected gauge")
+            for worker in workers:
+                lines.append(f'mcp_office_connected{{worker="{worker.index}",address="{label_value(worker.address)}"}} {1 if worker.loader is not None and worker.healthy else 0}')
+            lines.append("# HELP mcp_office_ping_seconds Latency of the last watchdog ping")
+            lines.append("# TYPE mcp_office_ping_seconds gauge")
+            for worker in workers:
+                if worker.last_ping is not None:
+                    lines.append(f'mcp_office_ping_seconds{{worker="{worker.index}"}} {worker.last_ping:.6f}')
+            lines.append("# HELP mcp_office_restarts_total Office restarts performed by the watchdog")
+            lines.append("# TYPE mcp_office_restarts_total counter")
+            for worker in workers:
+                lines.append(f'mcp_office_restarts_total{{worker="{worker.index}"}} {worker.restarts}')
+        return "\n".join(lines) + "\n"
+
+METRICS = ToolMetrics()
+
+PLAIN_VALUES = (str, bytes, int, float, bool, tuple, list, dict, type(None))
+
+def unwrap_uno(value):
+    if isinstance(value, TracedUno):
+        return object.__getattribute__(value, "_target")
+    if isinstance(value, (tuple, list)):
+        return type(value)(unwrap_uno(item) for item in value)
+    return value
+
+def uno_label(method: str) -> str:
+    # Names a returned object after the call that produced it: getCellRangeByName -> CellRange
+    name = re.sub(r"By[A-Z]\w*$", "", re.sub(r"^(get|create|next)", "", method))
+    return name or "Element"
+
+class TracedUno:
+    # Transparent proxy over a UNO object; method calls are timed into the trace active on the
+    # calling thread, and UNO objects they return are wrapped in turn
+    __slots__ = ("_target", "_label")
+
+    def __init__(self, target, label: str):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_label", label)
+
+    def __getattr__(self, name: str):
+        value = getattr(self._target, name)
+        if not callable(value):
+            return TRACER.wrap(value, name)
+        label = f"{self._label}.{name}"
+        def method(*args):
+            trace = TRACER.current()
+            started = time.time_ns()
+            failed = True
+            try:
+                result = value(*unwrap_uno(args))
+                failed = False
+            finally:
+                if trace is not None:
+                    trace.record(label, started, time.time_ns(), failed)
+            return TRACER.wrap(result, uno_label(name))
+        return method
+
+    def __setattr__(self, name: str, value):
+        setattr(self._target, name, unwrap_uno(value))
+
+    def __eq__(self, other):
+        return self._target == unwrap_uno(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f"TracedUno({self._label})"
+
+class TracedOoodev(TracedUno):
+    # Proxy over an ooodev helper (document, sheet, cell, range, chart). Each helper method, property
+    # and item access makes its bridge calls inside ooodev, so it is timed as one call
+    __slots__ = ()
+    # Plain attributes holding the underlying UNO object; returned unwrapped so callers can label it
+    UNTIMED = ("component",)
+
+    def _timed(self, name: str, fn, *args, **kwargs):
+        trace = TRACER.current()
+        started = time.time_ns()
+        failed = True
+        try:
+            result = fn(*unwrap_uno(args), **{key: unwrap_uno(value) for key, value in kwargs.items()})
+            failed = False
+        finally:
+            if trace is not None:
+                trace.record(f"{self._label}.{name}", started, time.time_ns(), failed)
+        return TRACER.wrap_helper(result)
+
+    def __getattr__(self, name: str):
+        target = self._target
+        if name in self.UNTIMED:
+            return getattr(target, name)
+        if isinstance(getattr(type(target), name, None), property):
+            return self._timed(name, getattr, target, name)
+        value = getattr(target, name)
+        if not callable(value):
+            return TRACER.wrap_helper(value)
+        return lambda *args, **kwargs: self._timed(name, value, *args, **kwargs)
+
+    def __setattr__(self, name: str, value):
+        target = self._target
+        if isinstance(getattr(type(target), name, None), property):
+            self._timed(name, setattr, target, name, value)
+        else:
+            setattr(target, name, unwrap_uno(value))
+
+    def __getitem__(self, key):
+        return self._timed("__getitem__", type(self._target).__getitem__, self._target, key)
+
+    def __repr__(self):
+        return f"TracedOoodev({self._label})"
+
+class UnoTrace:
+    def __init__(self, tool: str, doc_id: str | None, max_spans: int):
+        self.tool = tool
+        self.doc_id = doc_id
+        self.trace_id = uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.calls = {}
+        self.spans = []
+        self.max_spans = max_spans
+        self.dropped_spans = 0
+        self.encode_ns = 0
+        self.failed = False
+
+    def record(self, label: str, start_ns: int, end_ns: int, failed: bool):
+        entry = self.calls.setdefault(label, [0, 0])
+        entry[0] += 1
+        entry[1] += end_ns - start_ns
+        if len(self.spans) < self.max_spans:
+            self.spans.append((label, start_ns, end_ns, failed))
+        elif self.max_spans:
+            self.dropped_spans += 1
+
+    def measure_encoding(self, result):
+        # Estimates what serialising the response will cost once the tool has returned
+        started = time.perf_counter_ns()
+        try:
+            json.dumps(result, default=str)
+        except (TypeError, ValueError):
+            pass
+        self.encode_ns = time.perf_counter_ns() - started
+
+    def summary(self, top_n: int) -> Dict[str, Any]:
+        total_ns = (self.end_ns or time.time_ns()) - self.start_ns
+        uno_ns = sum(entry[1] for entry in self.calls.values())
+        top = sorted(self.calls.items(), key=lambda item: item[1][1], reverse=True)[:top_n]
+        return {
+            "uno_calls": sum(entry[0] for entry in self.calls.values()),
+            "total_ms": round(total_ns / 1e6, 3),
+            "uno_ms": round(uno_ns / 1e6, 3),
+            "encode_ms": round(self.encode_ns / 1e6, 3),
+            "python_ms": round(max(0, total_ns - uno_ns - self.encode_ns) / 1e6, 3),
+            "top": [{"call": label, "count": count, "ms": round(ns / 1e6, 3)} for label, (count, ns) in top]
+        }
+
+    def otlp(self) -> Dict[str, Any]:
+        # OTLP/JSON, as read by the OpenTelemetry Collector's otlpjsonfile receiver
+        def attributes(values):
+            return [
+                {"key": key, "value": {"intValue": str(value)} if isinstance(value, int) else {"stringValue": str(value)}}
+                for key, value in values.items()
+            ]
+        spans = [{
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.tool,
+            "kind": 2,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": attributes({"mcp.tool": self.tool, "mcp.doc_id": self.doc_id or "", "uno.calls": sum(entry[0] for entry in self.calls.values()), "uno.dropped_spans": self.dropped_spans}),
+            "status": {"code": 2 if self.failed else 1}
+        }]
+        for label, start_ns, end_ns, failed in self.spans:
+            spans.append({
+                "traceId": self.trace_id,
+                "spanId": uuid.uuid4().hex[:16],
+                "parentSpanId": self.span_id,
+                "name": label,
+                "kind": 3,
+                "startTimeUnixNano": str(start_ns),
+                "endTimeUnixNano": str(end_ns),
+                "attributes": attributes({"rpc.system": "uno", "rpc.method": label}),
+                "status": {"code": 2 if failed else 1}
+            })
+        return {"resourceSpans": [{
+            "resource": {"attributes": attributes({"service.name": "libreoffice-mcp"})},
+            "scopeSpans": [{"scope": {"name": "libreoffice-mcp.uno"}, "spans": spans}]
+        }]}
+
+class UnoTracer:
+    # Opt-in per-tool-call profile of UNO bridge calls made through TracedUno proxies
+    def __init__(self):
+        self.enabled = os.getenv("LIBREOFFICE_TRACE", "false").lower() in ("1", "true", "yes")
+        self.in_response = os.getenv("LIBREOFFICE_TRACE_RESPONSE", "false").lower() in ("1", "true", "yes")
+        self.top_n = max(1, int(os.getenv("LIBREOFFICE_TRACE_TOP", "5")))
+        self.span_file = os.getenv("LIBREOFFICE_TRACE_FILE", "")
+        self.max_spans = max(0, int(os.getenv("LIBREOFFICE_TRACE_MAX_SPANS", "1000"))) if self.span_file else 0
+        self.file_lock = threading.Lock()
+        self.state = threading.local()
+
+    def current(self) -> UnoTrace | None:
+        return getattr(self.state, "trace", None)
+
+    def wrap(self, value, label: str):
+        if not self.enabled or isinstance(value, PLAIN_VALUES + (TracedUno,)):
+            return value
+        return TracedUno(value, label)
+
+    def wrap_helper(self, value):
+        # Raw UNO objects handed out by ooodev get the per-method proxy; everything else is an ooodev helper
+        if not self.enabled or isinstance(value, PLAIN_VALUES + (TracedUno,)):
+            return value
+        if type(value).__name__ == "pyuno":
+            return TracedUno(value, "Element")
+        return TracedOoodev(value, type(value).__name__)
+
+    @contextmanager
+    def span(self, label: str):
+        # Times a single ooodev call whose result must stay unwrapped, such as a document load
+        trace = self.current()
+        started = time.time_ns()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            if trace is not None:
+                trace.record(label, started, time.time_ns(), failed)
+
+    @contextmanager
+    def trace(self, tool: str, doc_id: str | None):
+        # Nested tool calls (execute_batch) are folded into the outermost trace
+        if not self.enabled or self.current() is not None:
+            yield None
+            return
+        trace = UnoTrace(tool, doc_id, self.max_spans)
+        self.state.trace = trace
+        try:
+            yield trace
+        except Exception:
+            trace.failed = True
+            raise
+        finally:
+            self.state.trace = None
+            trace.end_ns = time.time_ns()
+            summary = trace.summary(self.top_n)
+            logger.info(f"UNO trace {tool} ({doc_id or '-'}): {json.dumps(summary)}")
+            METRICS.observe_uno(tool, summary["uno_calls"], summary["uno_ms"] / 1000)
+            if self.span_file:
+                self.export(trace)
+
+    def export(self, trace: UnoTrace):
+        try:
+            line = json.dumps(trace.otlp())
+            with self.file_lock, open(self.span_file, "a") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to export UNO trace to {self.span_file}: {e}")
+
+TRACER = UnoTracer()
+
+class ConnectionPool:
+    def __init__(self, data_source, max_size: int, idle_timeout: float):
+        self.data_source = data_source
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.idle = []
+        self.in_use = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def connection(self, username: str = "", password: str = ""):
+        connection = self.acquire(username, password)
+        try:
+            yield connection
+        finally:
+            self.release(username, password, connection)
+
+    def acquire(self, username: str = "", password: str = ""):
+        key = (username, password)
+        while True:
+            with self.lock:
+                match = next((entry for entry in self.idle if entry[0] == key), None)
+                if match is None:
+                    if self.in_use + len(self.idle) >= self.max_size and self.idle:
+                        self.close_connection(self.idle.pop(0)[1])
+                    if self.in_use >= self.max_size:
+                        raise RuntimeError(f"Connection pool exhausted ({self.max_size} connections in use)")
+                    self.in_use += 1
+                    break
+                self.idle.remove(match)
+                self.in_use += 1
+            if self.is_healthy(match[1]):
+                return match[1]
+            with self.lock:
+                self.in_use -= 1
+            self.close_connection(match[1])
+        try:
+            return self.data_source.getConnection(username, password)
+        except Exception:
+            with self.lock:
+                self.in_use -= 1
+            raise
+
+    def release(self, username: str, password: str, connection):
+        with self.lock:
+            self.in_use -= 1
+            if self.is_healthy(connection):
+                self.idle.append(((username, password), connection, time.monotonic()))
+                return
+        self.close_connection(connection)
+
+    def prune(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        with self.lock:
+            expired = [entry for entry in self.idle if entry[2] < cutoff]
+            self.idle = [entry for entry in self.idle if entry[2] >= cutoff]
+        for entry in expired:
+            self.close_connection(entry[1])
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for entry in idle:
+            self.close_connection(entry[1])
+
+    @staticmethod
+    def is_healthy(connection) -> bool:
+        try:
+            return not connection.isClosed()
+        except Exception:
+            return False
+
+    @staticmethod
+    def close_connection(connection):
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"Failed to close database connection: {e}")
+
+class QueryCursor:
+    def __init__(self, cursor_id: str, doc_id: str, pool: ConnectionPool, username: str, password: str, page_size: int):
+        self.cursor_id = cursor_id
+        self.doc_id = doc_id
+        self.pool = pool
+        self.username = username
+        self.password = password
+        self.page_size = page_size
+        self.connection = None
+        self.statement = None
+        self.result_set = None
+        self.columns = []
+        self.rows_read = 0
+        self.exhausted = False
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+    def execute(self, sql: str):
+        self.connection = self.pool.acquire(self.username, self.password)
+        self.statement = self.connection.createStatement()
+        self.result_set = self.statement.executeQuery(sql)
+        meta_data = self.result_set.getMetaData()
+        self.columns = [
+            {"name": meta_data.getColumnName(i), "type": meta_data.getColumnTypeName(i)}
+            for i in range(1, meta_data.getColumnCount() + 1)
+        ]
+
+    def fetch(self, page_size: int) -> List[Dict[str, str]]:
+        self.last_used = time.monotonic()
+        names = [column["name"] for column in self.columns]
+        rows = []
+        while len(rows) < page_size:
+            if not self.result_set.next():
+                self.exhausted = True
+                break
+            rows.append({name: self.result_set.getString(i) for i, name in enumerate(names, start=1)})
+        self.rows_read += len(rows)
+        return rows
+
+    def page(self, rows: List[Dict[str, str]]) -> Dict[str, Any]:
+        return {
+            "cursor_id": None if self.exhausted else self.cursor_id,
+            "columns": self.columns,
+            "rows": rows,
+            "rows_read": self.rows_read,
+            "has_more": not self.exhausted
+        }
+
+    def close(self):
+        for resource in (self.result_set, self.statement):
+            if resource is not None:
+                try:
+                    resource.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close cursor {self.cursor_id} resource: {e}")
+        if self.connection is not None:
+            self.pool.release(self.username, self.password, self.connection)
+        self.result_set = self.statement = self.connection = None
+
+class ParagraphIndex:
+    # Start offsets and lengths of the body paragraphs, so a character position
+    # resolves to one paragraph without walking a cursor through the whole text
+    def __init__(self, text):
+        self.text = text
+        self.paragraphs = []
+        self.starts = []
+        self.lengths = []
+        offset = 0
+        enum = text.createEnumeration()
+        while enum.hasMoreElements():
+            element = enum.nextElement()
+            if not element.supportsService("com.sun.star.text.Paragraph"):
+                continue
+            length = len(element.getString())
+            self.paragraphs.append(element)
+            self.starts.append(offset)
+            self.lengths.append(length)
+            offset += length + 1
+        self.total_length = max(0, offset - 1)
+
+    def locate(self, position: int):
+        if not self.paragraphs or position < 0 or position > self.total_length:
+            raise RuntimeError(f"Position {position} out of range (0-{self.total_length})")
+        index = bisect.bisect_right(self.starts, position) - 1
+        return index, position - self.starts[index]
+
+    def is_current(self, index: int) -> bool:
+        return len(self.paragraphs[index].getString()) == self.lengths[index]
+
+    def cursor_at(self, position: int):
+        index, offset = self.locate(position)
+        cursor = self.text.createTextCursorByRange(self.paragraphs[index].getStart())
+        while offset > 0:
+            step = min(offset, 32767)
+            cursor.goRight(step, False)
+            offset -= step
+        return cursor
+
+    def grow(self, position: int, length: int):
+        index, _ = self.locate(position)
+        self.lengths[index] += length
+        for i in range(index + 1, len(self.starts)):
+            self.starts[i] += length
+        self.total_length += length
+
 class AppContext:
     def __init__(self):
         self.loader = None
+        self.workers = []
+        self.pool_size = max(1, int(os.getenv("LIBREOFFICE_WORKERS", "1")))
         self.documents = {}
+        self.doc_workers = {}
         self.next_id = 0
+        self.registry_lock = threading.RLock()
+        self.batch_state = threading.local()
+        self.db_pools = {}
+        self.text_indexes = {}
+        self.doc_info = {}
+        self.shared_docs = {}
+        self.prewarm_sizes = parse_pool_sizes(os.getenv("LIBREOFFICE_PREWARM", ""))
+        self.prewarmed = {doc_type: collections.deque() for doc_type in self.prewarm_sizes}
+        self.refill_task = None
+        self.jobs = {}
+        self.next_job_id = 0
+        self.max_jobs = max(1, int(os.getenv("LIBREOFFICE_MAX_JOBS", "1000")))
+        self.revisions = {}
+        self.max_stream_bytes = int(float(os.getenv("LIBREOFFICE_MAX_STREAM_MB", "100")) * 1024 * 1024)
+        self.loop = None
+        self.max_documents = int(os.getenv("LIBREOFFICE_MAX_DOCUMENTS", "0"))
+        self.max_document_bytes = float(os.getenv("LIBREOFFICE_MAX_DOCUMENT_MB", "0")) * 1024 * 1024
+        self.document_idle_ttl = float(os.getenv("LIBREOFFICE_DOCUMENT_IDLE_TTL", "0"))
+        self.autosave_on_evict = os.getenv("LIBREOFFICE_AUTOSAVE_ON_EVICT", "false").lower() in ("1", "true", "yes")
+        self.db_pool_size = max(1, int(os.getenv("LIBREOFFICE_DB_POOL_SIZE", "4")))
+        self.db_idle_timeout = float(os.getenv("LIBREOFFICE_DB_IDLE_TIMEOUT", "300"))
+        self.cursors = {}
+        self.next_cursor_id = 0
+        self.max_cursors = max(1, int(os.getenv("LIBREOFFICE_MAX_CURSORS", "32")))
+        self.cursor_idle_timeout = float(os.getenv("LIBREOFFICE_CURSOR_IDLE_TIMEOUT", "120"))
+        self.housekeeping_interval = float(os.getenv("LIBREOFFICE_HOUSEKEEPING_INTERVAL", "30"))
+        self.spawn_office = os.getenv("LIBREOFFICE_SPAWN", "false").lower() in ("1", "true", "yes")
+        self.connection = os.getenv("LIBREOFFICE_CONNECTION", "socket").lower()
+        if self.connection not in ("socket", "pipe"):
+            raise RuntimeError("Invalid LIBREOFFICE_CONNECTION. Use: socket, pipe")
+        self.pipe_prefix = os.getenv("LIBREOFFICE_PIPE_NAME", f"libreoffice_mcp_{os.getpid()}")
+        self.profile_root = os.getenv("LIBREOFFICE_PROFILE_DIR", "")
+        self.owns_profile_root = False
+        self.office_binary = os.getenv("LIBREOFFICE_BINARY", "soffice")
+        self.startup_timeout = float(os.getenv("LIBREOFFICE_STARTUP_TIMEOUT", "30"))
+        self.watchdog_interval = float(os.getenv("LIBREOFFICE_WATCHDOG_INTERVAL", "10"))
+        self.ping_timeout = float(os.getenv("LIBREOFFICE_PING_TIMEOUT", "5"))
+        self.watchdog_failures = max(1, int(os.getenv("LIBREOFFICE_WATCHDOG_FAILURES", "2")))
+        self.restart_attempts = max(1, int(os.getenv("LIBREOFFICE_RESTART_ATTEMPTS", "5")))
+        self.restart_backoff = float(os.getenv("LIBREOFFICE_RESTART_BACKOFF", "1"))
+        self.restart_timeout = float(os.getenv("LIBREOFFICE_RESTART_TIMEOUT", "120"))
+        self.reload_lost = os.getenv("LIBREOFFICE_RELOAD_LOST", "true").lower() in ("1", "true", "yes")
+        self.lost_documents = collections.OrderedDict()
+        # Pings and restarts run on their own threads so a hung bridge cannot starve the UNO executor,
+        # and hung pings cannot hold up the restart that clears them
+        self.watchdog_pool = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="watchdog")
+        self.restart_pool = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="office-restart")
+        self.executor = UnoExecutor(
+            threads=max(1, int(os.getenv("LIBREOFFICE_UNO_THREADS", str(self.pool_size)))),
+            max_pending=max(1, int(os.getenv("LIBREOFFICE_UNO_QUEUE_SIZE", "256")))
+        )
         self.output_dir = os.getenv("LIBREOFFICE_OUTPUT_DIR", "/home/open-webui/output")
         os.makedirs(self.output_dir, exist_ok=True)
+        self.export_cache = ExportCache(
+            os.getenv("LIBREOFFICE_EXPORT_CACHE_DIR", os.path.join(self.output_dir, ".export_cache")),
+            int(float(os.getenv("LIBREOFFICE_EXPORT_CACHE_MB", "256")) * 1024 * 1024),
+            os.getenv("LIBREOFFICE_EXPORT_CACHE_HARDLINK", "false").lower() in ("1", "true", "yes")
+        )
 
     def start_office(self):
-        if self.loader is None:
+        if not self.workers:
+            base_port = int(os.getenv("LIBREOFFICE_PORT", "2083"))
+            if self.spawn_office and not self.profile_root:
+                self.profile_root = tempfile.mkdtemp(prefix="libreoffice-mcp-")
+                self.owns_profile_root = True
             try:
-                self.loader = Lo.load_office(
-                    connector=Lo.ConnectSocket(host="localhost", port=int(os.getenv("LIBREOFFICE_PORT", "2083"))),
-                    opt=Options(log_level="INFO")
-                )
+                for index in range(self.pool_size):
+                    worker = OfficeWorker(
+                        index,
+                        base_port + index,
+                        pipe_name=f"{self.pipe_prefix}_{index}" if self.connection == "pipe" else None,
+                        profile_dir=os.path.join(self.profile_root, f"worker_{index}") if self.spawn_office else None
+                    )
+                    self.workers.append(worker)
+                    if self.spawn_office:
+                        worker.spawn(self.office_binary)
+                        worker.connect_when_ready(self.startup_timeout)
+                    else:
+                        worker.connect()
             except Exception as e:
                 logger.error(f"Failed to connect to LibreOffice: {e}")
+                self.close_office()
                 raise
+            self.loader = self.workers[0].loader
         return self.loader
 
-    def get_document(self, doc_id: str):
-        return self.documents.get(doc_id)
+    def pick_worker(self) -> OfficeWorker:
+        usable = [worker for worker in self.workers if worker.usable]
+        if not usable:
+            raise RuntimeError("No LibreOffice worker is available; all offices are down or restarting")
+        return min(usable, key=lambda worker: len(worker.doc_ids))
+
+    def worker_for(self, doc_id: str) -> OfficeWorker:
+        return self.doc_workers.get(doc_id) or self.workers[0]
+
+    def get_document(self, doc_id: str, native: bool = True):
+        info = self.doc_info.get(doc_id)
+        if info is not None:
+            info["last_access"] = time.monotonic()
+        doc = self.documents.get(doc_id)
+        if doc is None and doc_id in self.lost_documents:
+            raise RuntimeError(f"Document {doc_id} was lost: {self.lost_documents[doc_id]}")
+        if native and isinstance(doc, SpreadsheetReader):
+            doc = self.promote_document(doc_id, "requested by a tool that needs LibreOffice")
+        return doc
+
+    def promote_document(self, doc_id: str, reason: str):
+        # Swaps a Python-parsed spreadsheet for a real LibreOffice document, for every alias of it
+        reader = self.documents.get(doc_id)
+        if not isinstance(reader, SpreadsheetReader):
+            return reader
+        worker = self.pick_worker()
+        doc = load_document(worker, reader.path, CalcDoc, "edit")
+        with self.registry_lock:
+            for other_id, other in list(self.documents.items()):
+                if other is reader:
+                    self.documents[other_id] = doc
+                    self.doc_workers[other_id] = worker
+                    worker.doc_ids.add(other_id)
+            for entry in self.shared_docs.values():
+                if entry["doc"] is reader:
+                    entry["doc"] = doc
+                    entry["worker"] = worker
+        reader.close_doc()
+        logger.info(f"Loaded {doc_id} into LibreOffice ({reason})")
+        return doc
+
+    def get_sheet(self, doc, sheet_name: str):
+        sheet_cache = getattr(self.batch_state, "sheets", None)
+        if sheet_cache is None:
+            return TRACER.wrap_helper(doc).sheets.get_by_name(sheet_name)
+        if sheet_name not in sheet_cache:
+            sheet_cache[sheet_name] = TRACER.wrap_helper(doc).sheets.get_by_name(sheet_name)
+        return sheet_cache[sheet_name]
+
+    def get_db_pool(self, doc_id: str) -> ConnectionPool:
+        with self.registry_lock:
+            pool = self.db_pools.get(doc_id)
+            if pool is None:
+                doc = self.documents.get(doc_id)
+                if not doc:
+                    raise RuntimeError("Document not found")
+                pool = ConnectionPool(TRACER.wrap(doc, "DatabaseDocument").getDataSource(), self.db_pool_size, self.db_idle_timeout)
+                self.db_pools[doc_id] = pool
+        return pool
+
+    def close_db_pool(self, doc_id: str):
+        for cursor in [c for c in list(self.cursors.values()) if c.doc_id == doc_id]:
+            self.close_cursor(cursor.cursor_id)
+        with self.registry_lock:
+            pool = self.db_pools.pop(doc_id, None)
+        if pool:
+            pool.close()
+
+    def open_cursor(self, doc_id: str, sql: str, username: str, password: str, page_size: int) -> QueryCursor:
+        pool = self.get_db_pool(doc_id)
+        # Every open cursor holds a pooled connection, so keep one connection free for other queries
+        per_doc = max(1, pool.max_size - 1)
+        with self.registry_lock:
+            cursor_id = f"cursor_{self.next_cursor_id}"
+            self.next_cursor_id += 1
+            by_age = sorted(self.cursors.values(), key=lambda c: c.last_used)
+            doc_cursors = [c for c in by_age if c.doc_id == doc_id]
+            overflow = doc_cursors[:max(0, len(doc_cursors) + 1 - per_doc)]
+            others = [c for c in by_age if c not in overflow]
+            overflow += others[:max(0, len(others) + 1 - self.max_cursors)]
+        for stale in overflow:
+            self.close_cursor(stale.cursor_id)
+        cursor = QueryCursor(cursor_id, doc_id, pool, username, password, page_size)
+        try:
+            cursor.execute(sql)
+        except Exception:
+            cursor.close()
+            raise
+        with self.registry_lock:
+            self.cursors[cursor_id] = cursor
+        return cursor
+
+    def get_cursor(self, doc_id: str, cursor_id: str) -> QueryCursor:
+        cursor = self.cursors.get(cursor_id)
+        if cursor is None or cursor.doc_id != doc_id:
+            raise RuntimeError(f"Cursor {cursor_id} not found or expired")
+        return cursor
+
+    def close_cursor(self, cursor_id: str, wait: bool = True) -> bool:
+        cursor = self.cursors.get(cursor_id)
+        if cursor is None or not cursor.lock.acquire(blocking=wait):
+            return False
+        try:
+            with self.registry_lock:
+                self.cursors.pop(cursor_id, None)
+            cursor.close()
+        finally:
+            cursor.lock.release()
+        return True
+
+    def housekeeping(self):
+        cutoff = time.monotonic() - self.cursor_idle_timeout
+        for cursor in [c for c in list(self.cursors.values()) if c.last_used < cutoff]:
+            if self.close_cursor(cursor.cursor_id, wait=False):
+                logger.info(f"Closed idle cursor {cursor.cursor_id} on {cursor.doc_id}")
+        for pool in list(self.db_pools.values()):
+            pool.prune()
+
+    def get_text_index(self, doc_id: str, doc, position: int | None = None) -> ParagraphIndex:
+        # Keyed like the executor lock, so shared aliases of one document see each other's edits
+        key = self.lock_key(doc_id)
+        index = self.text_indexes.get(key)
+        if index is not None and position is not None:
+            try:
+                if not index.is_current(index.locate(position)[0]):
+                    index = None
+            except RuntimeError:
+                index = None
+        if index is None:
+            index = ParagraphIndex(TRACER.wrap(doc.component, "Document").getText())
+            self.text_indexes[key] = index
+        return index
+
+    def invalidate_text_index(self, doc_id: str):
+        self.text_indexes.pop(self.lock_key(doc_id), None)
 
-    def add_document(self, doc_id: str, doc):
-        self.documents[doc_id] = doc
+    def add_document(self, doc_id: str, doc, worker: OfficeWorker | None = None):
+        # Documents parsed in Python are not held by any office process
+        if worker is None and not isinstance(doc, SpreadsheetReader):
+            worker = self.workers[0]
+        with self.registry_lock:
+            self.documents[doc_id] = doc
+            self.doc_workers[doc_id] = worker
+            if worker:
+                worker.doc_ids.add(doc_id)
+
+    def register_document(self, doc, worker: OfficeWorker | None, path: str | None = None, shared_key: str | None = None, size: int | None = None, token: str | None = None) -> str:
+        with self.registry_lock:
+            doc_id = f"doc_{self.next_id}"
+            self.next_id += 1
+            stat = os.stat(path) if path and os.path.isfile(path) else None
+            if size is None:
+                size = stat.st_size if stat else DEFAULT_DOCUMENT_SIZE
+            self.doc_info[doc_id] = {
+                "path": path,
+                "source_stat": (stat.st_mtime_ns, stat.st_size) if stat else None,
+                "size": size,
+                "shared_key": shared_key,
+                "token": token or uuid.uuid4().hex,
+                "last_access": time.monotonic()
+            }
+            self.add_document(doc_id, doc, worker)
+        if self.loop is not None and self.eviction_candidates():
+            asyncio.run_coroutine_threadsafe(evict_documents(self), self.loop)
+        return doc_id
+
+    def take_prewarmed(self, doc_type: str):
+        with self.registry_lock:
+            pool = self.prewarmed.get(doc_type)
+            entry = pool.popleft() if pool else None
+        if entry is not None:
+            self.request_refill()
+        return entry
+
+    def prewarm_document(self, doc_type: str):
+        worker = self.pick_worker()
+        doc = create_blank_document(worker, doc_type)
+        with self.registry_lock:
+            self.prewarmed[doc_type].append((doc, worker))
+
+    def request_refill(self):
+        if self.loop is None or not self.prewarm_sizes:
+            return
+        def start():
+            if self.refill_task is None or self.refill_task.done():
+                self.refill_task = asyncio.create_task(refill_prewarmed(self))
+        self.loop.call_soon_threadsafe(start)
+
+    def close_prewarmed(self):
+        with self.registry_lock:
+            entries = [entry for pool in self.prewarmed.values() for entry in pool]
+            for pool in self.prewarmed.values():
+                pool.clear()
+        for doc, _ in entries:
+            try:
+                doc.close_doc()
+            except Exception as e:
+                logger.error(f"Failed to close pre-warmed document: {e}")
+
+    def create_job(self, kind: str, **details) -> Dict[str, Any]:
+        with self.registry_lock:
+            job_id = f"job_{self.next_job_id}"
+            self.next_job_id += 1
+            job = {
+                "job_id": job_id,
+                "kind": kind,
+                "status": "queued",
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                "error": None,
+                "result": None,
+                **details
+            }
+            self.jobs[job_id] = job
+            finished = sorted((j for j in self.jobs.values() if j["finished"] is not None), key=lambda j: j["finished"])
+            for old in finished[:max(0, len(self.jobs) - self.max_jobs)]:
+                del self.jobs[old["job_id"]]
+        return job
+
+    def find_queued_job(self, kind: str, **details):
+        with self.registry_lock:
+            for job in self.jobs.values():
+                if job["kind"] == kind and job["status"] == "queued" and all(job.get(k) == v for k, v in details.items()):
+                    return job
+        return None
+
+    def run_job(self, job: Dict[str, Any], fn, *args):
+        job["status"] = "running"
+        job["started"] = time.time()
+        try:
+            job["result"] = fn(*args)
+            job["status"] = "done"
+        except Exception as e:
+            job["error"] = str(e)
+            job["status"] = "failed"
+        finally:
+            job["finished"] = time.time()
+
+    def submit_job(self, job: Dict[str, Any], lock_key, fn, *args):
+        if self.loop is None:
+            self.run_job(job, fn, *args)
+        else:
+            asyncio.run_coroutine_threadsafe(execute_job(self, job, lock_key, fn, *args), self.loop)
+
+    def open_shared(self, path: str, doc_class, mode: str = "edit") -> str | None:
+        real_path = os.path.realpath(path)
+        key = f"{mode}:{real_path}"
+        try:
+            stat = os.stat(real_path)
+        except OSError:
+            return None
+        with self.registry_lock:
+            entry = self.shared_docs.get(key)
+            if entry is None or (entry["mtime"], entry["size"]) != (stat.st_mtime_ns, stat.st_size):
+                return None
+            if not any(doc is entry["doc"] for doc in self.documents.values()):
+                return None
+            if doc_class is not None and not isinstance(entry["doc"], doc_class):
+                return None
+            # Aliases share the loaded document, so they count nothing towards the memory budget
+            return self.register_document(entry["doc"], entry["worker"], path, shared_key=key, size=0, token=entry["token"])
+
+    def share_document(self, doc_id: str, path: str, mode: str = "edit"):
+        real_path = os.path.realpath(path)
+        key = f"{mode}:{real_path}"
+        stat = os.stat(real_path)
+        with self.registry_lock:
+            self.shared_docs[key] = {
+                "doc": self.documents[doc_id],
+                "worker": self.doc_workers[doc_id],
+                "token": self.doc_info[doc_id]["token"],
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size
+            }
+            self.doc_info[doc_id]["shared_key"] = key
+            self.text_indexes.pop(doc_id, None)
+
+    def lock_key(self, doc_id: str | None):
+        info = self.doc_info.get(doc_id) if doc_id else None
+        return (info and info["shared_key"]) or doc_id
+
+    def bump_revision(self, doc_id: str):
+        info = self.doc_info.get(doc_id)
+        if info is not None:
+            with self.registry_lock:
+                self.revisions[info["token"]] = self.revisions.get(info["token"], 0) + 1
+
+    def export_key(self, doc_id: str, doc, target: str) -> str:
+        # Unmodified documents are identified by the hash of the file they were loaded from, so every
+        # handle on the same file shares cache entries; otherwise by load token and edit revision
+        info = self.doc_info[doc_id]
+        revision = self.revisions.get(info["token"], 0)
+        path = info["path"]
+        identity = f"rev:{info['token']}:{revision}"
+        if revision == 0 and info["source_stat"] and os.path.isfile(path):
+            stat = os.stat(path)
+            if (stat.st_mtime_ns, stat.st_size) == info["source_stat"] and not doc.component.isModified():
+                identity = f"sha256:{self.export_cache.source_digest(path)}"
+        ext = os.path.splitext(target)[1].lower()
+        return hashlib.sha256(f"{identity}|{ext}".encode()).hexdigest()
+
+    def export_document(self, doc_id: str, doc, target: str, tag: str) -> bool:
+        ext = os.path.splitext(target)[1]
+        key = self.export_key(doc_id, doc, target) if self.export_cache.enabled else None
+        if key and self.export_cache.fetch(key, ext, target):
+            return True
+        save_atomically(doc, target, tag)
+        if key:
+            try:
+                self.export_cache.store(key, ext, target)
+            except OSError as e:
+                logger.warning(f"Failed to cache export of {doc_id}: {e}")
+        return False
+
+    def has_other_refs(self, doc_id: str) -> bool:
+        with self.registry_lock:
+            doc = self.documents.get(doc_id)
+            return any(other is doc for other_id, other in self.documents.items() if other_id != doc_id)
+
+    def close_document(self, doc_id: str):
+        doc = self.documents.get(doc_id)
+        if doc is None:
+            return
+        self.close_db_pool(doc_id)
+        if not self.has_other_refs(doc_id):
+            with TRACER.span(f"{type(doc).__name__}.close_doc"):
+                doc.close_doc()
+        self.remove_document(doc_id)
+
+    def eviction_candidates(self):
+        now = time.monotonic()
+        with self.registry_lock:
+            entries = sorted(((doc_id, dict(info)) for doc_id, info in self.doc_info.items()), key=lambda item: item[1]["last_access"])
+        victims = []
+        if self.document_idle_ttl > 0:
+            victims = [(doc_id, info["last_access"], "idle") for doc_id, info in entries if now - info["last_access"] > self.document_idle_ttl]
+        idle_ids = {victim[0] for victim in victims}
+        remaining = [entry for entry in entries if entry[0] not in idle_ids]
+        count = len(remaining)
+        total = sum(info["size"] for _, info in remaining)
+        # The most recently used document is never evicted to make room for itself
+        for doc_id, info in remaining[:-1]:
+            over_count = self.max_documents > 0 and count > self.max_documents
+            over_size = self.max_document_bytes > 0 and total > self.max_document_bytes
+            if not over_count and not over_size:
+                break
+            victims.append((doc_id, info["last_access"], "count budget" if over_count else "memory budget"))
+            count -= 1
+            total -= info["size"]
+        return victims
+
+    def evict_document(self, doc_id: str, last_access: float, reason: str):
+        info = self.doc_info.get(doc_id)
+        doc = self.documents.get(doc_id)
+        if info is None or doc is None or info["last_access"] != last_access:
+            return
+        if self.autosave_on_evict and not self.has_other_refs(doc_id) and not isinstance(doc, SpreadsheetReader):
+            try:
+                if doc.component.isModified():
+                    autosave_dir = os.path.join(self.output_dir, "autosave")
+                    os.makedirs(autosave_dir, exist_ok=True)
+                    name = os.path.basename(info["path"]) if info["path"] else f"{doc_id}.{default_extension(doc)}"
+                    target = os.path.join(autosave_dir, f"{doc_id}_{name}")
+                    doc.save_doc(fnm=target)
+                    logger.info(f"Autosaved {doc_id} to {target}")
+            except Exception as e:
+                logger.error(f"Failed to autosave {doc_id}, closing without saving: {e}")
+        try:
+            self.close_document(doc_id)
+        finally:
+            self.remove_document(doc_id)
+        logger.info(f"Evicted {doc_id} ({reason})")
 
     def remove_document(self, doc_id: str):
-        self.documents.pop(doc_id, None)
+        with self.registry_lock:
+            self.documents.pop(doc_id, None)
+            worker = self.doc_workers.pop(doc_id, None)
+            if worker:
+                worker.doc_ids.discard(doc_id)
+            info = self.doc_info.pop(doc_id, None)
+            lock_key = (info and info["shared_key"]) or doc_id
+            if info and not any(other["token"] == info["token"] for other in self.doc_info.values()):
+                self.revisions.pop(info["token"], None)
+            if lock_key != doc_id:
+                if any(other["shared_key"] == lock_key for other in self.doc_info.values()):
+                    lock_key = None
+                else:
+                    self.shared_docs.pop(lock_key, None)
+            if lock_key:
+                self.text_indexes.pop(lock_key, None)
+        if lock_key:
+            self.executor.forget(lock_key)
+
+    def restart_worker(self, worker: OfficeWorker):
+        logger.warning(f"Restarting LibreOffice worker {worker.index} on {worker.address}")
+        worker.kill()
+        if self.spawn_office:
+            worker.spawn(self.office_binary)
+            worker.connect_when_ready(self.startup_timeout)
+        else:
+            # An externally managed soffice is expected to be restarted by its supervisor
+            worker.connect_when_ready(self.startup_timeout)
+        worker.restarts += 1
+        if worker.index == 0:
+            self.loader = worker.loader
+        self.recover_documents(worker)
+
+    def recover_documents(self, worker: OfficeWorker):
+        # Documents held by a dead office are reloaded from the file they came from, or marked lost
+        with self.registry_lock:
+            affected = sorted(worker.doc_ids)
+            worker.doc_ids.clear()
+            for doc_type, pool in self.prewarmed.items():
+                self.prewarmed[doc_type] = collections.deque(entry for entry in pool if entry[1] is not worker)
+        self.request_refill()
+        replacements = {}
+        for doc_id in affected:
+            old = self.documents.get(doc_id)
+            info = self.doc_info.get(doc_id)
+            if old is None or info is None:
+                continue
+            self.close_db_pool(doc_id)
+            self.invalidate_text_index(doc_id)
+            if id(old) not in replacements:
+                replacements[id(old)] = None
+                if self.reload_lost and info["path"] and os.path.exists(info["path"]):
+                    try:
+                        if isinstance(old, (CalcDoc, WriteDoc, DrawDoc)):
+                            doc = load_document(worker, info["path"], type(old), "edit")
+                        else:
+                            doc = Lo.open_doc(fnm=info["path"], loader=worker.loader)
+                        replacements[id(old)] = (doc, uuid.uuid4().hex)
+                    except Exception as e:
+                        logger.error(f"Failed to reload {doc_id} from {info['path']}: {e}")
+            replacement = replacements[id(old)]
+            if replacement is None:
+                self.remove_document(doc_id)
+                self.lost_documents[doc_id] = f"LibreOffice worker {worker.index} was restarted and the document could not be reloaded"
+                while len(self.lost_documents) > 1000:
+                    self.lost_documents.popitem(last=False)
+                logger.error(f"Lost {doc_id} in the restart of worker {worker.index}")
+                continue
+            doc, token = replacement
+            with self.registry_lock:
+                self.documents[doc_id] = doc
+                self.doc_workers[doc_id] = worker
+                worker.doc_ids.add(doc_id)
+                info["token"] = token
+                for entry in self.shared_docs.values():
+                    if entry["doc"] is old:
+                        entry.update(doc=doc, worker=worker, token=token)
+            logger.warning(f"Reloaded {doc_id} from {info['path']} after the restart of worker {worker.index}; unsaved changes were lost")
+
+    def health(self) -> Dict[str, Any]:
+        workers = [{
+            "worker": worker.index,
+            "address": worker.address,
+            "healthy": worker.healthy,
+            "ping_ms": round(worker.last_ping * 1000, 3) if worker.last_ping is not None else None,
+            "failures": worker.failures,
+            "restarts": worker.restarts
+        } for worker in list(self.workers)]
+        ready = bool(workers) and all(worker["healthy"] for worker in workers)
+        return {
+            "status": "ok" if ready else "degraded",
+            "workers": workers,
+            "open_documents": len(self.documents),
+            "lost_documents": len(self.lost_documents)
+        }
 
     def close_office(self):
-        if self.loader is not None:
-            Lo.close_office()
-            self.loader = None
+        for worker in reversed(self.workers):
+            try:
+                worker.close()
+            except Exception as e:
+                logger.error(f"Failed to close LibreOffice on {worker.address}: {e}")
+        self.workers = []
+        self.loader = None
+        if self.owns_profile_root:
+            shutil.rmtree(self.profile_root, ignore_errors=True)
+            self.profile_root = ""
+            self.owns_profile_root = False
 
     def format_cell_range(self, doc_id: str, sheet_name: str, range_address: str, font_name: str = "Arial", font_size: int = 12, bold: bool = False, italic: bool = False, alignment: str = "center"):
         doc = self.get_document(doc_id)
         if not doc or not isinstance(doc, CalcDoc):
             raise RuntimeError("Document is not a spreadsheet")
-        sheet = doc.sheets.get_by_name(sheet_name)
+        sheet = self.get_sheet(doc, sheet_name)
         rng = sheet.rng(range_address)
         rng.set_font_name(font_name)
         rng.set_font_size(font_size)
@@ -83,20 +1915,34 @@ class AppContext:
         doc = self.get_document(doc_id)
         if not doc or not isinstance(doc, CalcDoc):
             raise RuntimeError("Document is not a spreadsheet")
-        sheet = doc.sheets.get_by_name(sheet_name)
-        rng = sheet.rng(range_address)
-        for cell in rng:
-            if isinstance(cell.value, (int, float)) and cell.value > threshold:
-                cell.set_background_color(above_color)
-            elif isinstance(cell.value, (int, float)):
-                cell.set_background_color(below_color)
+        sheet = self.get_sheet(doc, sheet_name)
+        from com.sun.star.sheet.ConditionOperator import FORMULA
+        from com.sun.star.table import CellAddress
+        cell_range = TRACER.wrap(sheet.component, "Sheet").getCellRangeByName(range_address)
+        addr = cell_range.getRangeAddress()
+        origin = f"{column_name(addr.StartColumn)}{addr.StartRow + 1}"
+        source = CellAddress(addr.Sheet, addr.StartColumn, addr.StartRow)
+        conditions = [
+            (f"AND(ISNUMBER({origin});{origin}>{threshold})", above_color),
+            (f"AND(ISNUMBER({origin});{origin}<={threshold})", below_color)
+        ]
+        entries = cell_range.getPropertyValue("ConditionalFormat")
+        entries.clear()
+        for formula, color in conditions:
+            entries.addNew(make_props(
+                Operator=FORMULA,
+                Formula1=formula,
+                SourcePosition=source,
+                StyleName=ensure_cell_style(doc, color)
+            ))
+        cell_range.setPropertyValue("ConditionalFormat", entries)
         return f"Applied conditional formatting to {range_address} with threshold {threshold}"
 
     def create_chart(self, doc_id: str, sheet_name: str, range_address: str, target_cell: str, chart_type: str, title: str = "", x_label: str = "", y_label: str = "", show_legend: bool = True, show_data_labels: bool = False):
         doc = self.get_document(doc_id)
         if not doc or not isinstance(doc, CalcDoc):
             raise RuntimeError("Document is not a spreadsheet")
-        sheet = doc.sheets.get_by_name(sheet_name)
+        sheet = self.get_sheet(doc, sheet_name)
         chart_types = {
             "column": ChartTypes.Column.TEMPLATE_STACKED.COLUMN,
             "bar": ChartTypes.Bar.TEMPLATE_STACKED.BAR,
@@ -121,26 +1967,179 @@ class AppContext:
             chart.set_data_point_labels(True)
         return f"Created {chart_type} chart at {target_cell} with title '{title}', legend={show_legend}, data_labels={show_data_labels}"
 
+async def run_housekeeping(app_ctx: AppContext):
+    while True:
+        await asyncio.sleep(app_ctx.housekeeping_interval)
+        try:
+            await app_ctx.executor.submit(None, app_ctx.housekeeping)
+        except Exception as e:
+            logger.error(f"Housekeeping failed: {e}")
+        await evict_documents(app_ctx)
+
+def watch(future):
+    # Shielded watchdog futures may finish after nobody awaits them; consume the outcome so it is not logged as lost
+    future.add_done_callback(lambda done: done.cancelled() or done.exception())
+    return future
+
+async def run_watchdog(app_ctx: AppContext):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(app_ctx.watchdog_interval)
+        for worker in list(app_ctx.workers):
+            if worker.pending_restart is not None and not worker.pending_restart.done():
+                continue
+            try:
+                if worker.pending_ping is not None and not worker.pending_ping.done():
+                    # Each hung ping holds a watchdog thread, so a worker never has more than one in flight
+                    raise RuntimeError("previous ping is still outstanding")
+                worker.pending_ping = watch(loop.run_in_executor(app_ctx.watchdog_pool, worker.ping))
+                worker.last_ping = await asyncio.wait_for(asyncio.shield(worker.pending_ping), app_ctx.ping_timeout)
+                worker.failures = 0
+                worker.healthy = True
+                continue
+            except asyncio.TimeoutError:
+                error = f"no reply within {app_ctx.ping_timeout}s"
+            except Exception as e:
+                error = str(e)
+            worker.failures += 1
+            logger.error(f"LibreOffice worker {worker.index} failed health check {worker.failures}/{app_ctx.watchdog_failures}: {error}")
+            if worker.failures >= app_ctx.watchdog_failures:
+                worker.healthy = False
+                await recover_worker(app_ctx, worker)
+
+async def recover_worker(app_ctx: AppContext, worker: OfficeWorker):
+    loop = asyncio.get_running_loop()
+    delay = app_ctx.restart_backoff
+    for attempt in range(1, app_ctx.restart_attempts + 1):
+        worker.pending_restart = watch(loop.run_in_executor(app_ctx.restart_pool, app_ctx.restart_worker, worker))
+        try:
+            await asyncio.wait_for(asyncio.shield(worker.pending_restart), app_ctx.restart_timeout)
+            logger.info(f"LibreOffice worker {worker.index} is back after {attempt} attempt(s)")
+            return
+        except asyncio.TimeoutError:
+            logger.error(f"Restart {attempt}/{app_ctx.restart_attempts} of LibreOffice worker {worker.index} timed out after {app_ctx.restart_timeout}s")
+            # Killing the office from here makes the stuck restart fail instead of holding its thread
+            process = worker.process
+            if process is not None:
+                process.kill()
+            await asyncio.wait([worker.pending_restart], timeout=app_ctx.ping_timeout)
+            if not worker.pending_restart.done():
+                logger.error(f"Restart of LibreOffice worker {worker.index} is still stuck; retrying once it finishes")
+                return
+        except Exception as e:
+            logger.error(f"Restart {attempt}/{app_ctx.restart_attempts} of LibreOffice worker {worker.index} failed: {e}")
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 30)
+    logger.error(f"Giving up on LibreOffice worker {worker.index} until the next watchdog pass")
+
+async def execute_job(app_ctx: AppContext, job: Dict[str, Any], lock_key, fn, *args):
+    try:
+        await app_ctx.executor.submit(lock_key, app_ctx.run_job, job, fn, *args)
+    except Exception as e:
+        job["error"] = str(e)
+        job["status"] = "failed"
+        job["finished"] = time.time()
+
+async def refill_prewarmed(app_ctx: AppContext):
+    for doc_type, size in app_ctx.prewarm_sizes.items():
+        while len(app_ctx.prewarmed[doc_type]) < size:
+            try:
+                await app_ctx.executor.submit(None, app_ctx.prewarm_document, doc_type)
+            except Exception as e:
+                logger.error(f"Failed to pre-warm {doc_type} document: {e}")
+                break
+
+async def evict_documents(app_ctx: AppContext):
+    for doc_id, last_access, reason in app_ctx.eviction_candidates():
+        try:
+            await app_ctx.executor.submit(app_ctx.lock_key(doc_id), app_ctx.evict_document, doc_id, last_access, reason)
+        except Exception as e:
+            logger.error(f"Failed to evict {doc_id}: {e}")
+
 @asynccontextmanager
 async def app_lifespan(server: FastMCP):
     app_ctx = AppContext()
+    housekeeping = None
+    watchdog = None
     try:
         app_ctx.start_office()
+        app_ctx.loop = asyncio.get_running_loop()
+        METRICS.app_ctx = app_ctx
+        app_ctx.request_refill()
+        housekeeping = asyncio.create_task(run_housekeeping(app_ctx))
+        if app_ctx.watchdog_interval > 0:
+            watchdog = asyncio.create_task(run_watchdog(app_ctx))
         yield app_ctx
     except Exception as e:
         logger.error(f"Error in LibreOffice lifespan: {e}")
         raise
     finally:
+        METRICS.app_ctx = None
+        if watchdog:
+            watchdog.cancel()
+        if housekeeping:
+            housekeeping.cancel()
+        if app_ctx.refill_task:
+            app_ctx.refill_task.cancel()
+        app_ctx.close_prewarmed()
+        for doc_id in list(app_ctx.db_pools.keys()):
+            app_ctx.close_db_pool(doc_id)
         for doc_id in list(app_ctx.documents.keys()):
-            doc = app_ctx.get_document(doc_id)
-            if doc:
-                doc.close_doc()
-            app_ctx.remove_document(doc_id)
+            try:
+                app_ctx.close_document(doc_id)
+            except Exception as e:
+                logger.error(f"Failed to close {doc_id}: {e}")
+                app_ctx.remove_document(doc_id)
+        app_ctx.executor.shutdown()
+        app_ctx.watchdog_pool.shutdown(wait=False)
+        app_ctx.restart_pool.shutdown(wait=False)
         app_ctx.close_office()
 
 
 mcp = FastMCP("LibreOffice OooDev MCP", lifespan=app_lifespan)
 
+TOOLS = {}
+
+def instrumented(fn):
+    # Times every call of an MCP tool into METRICS, labelled with the tool name and doc type
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with METRICS.track(fn.__name__, METRICS.doc_type(kwargs)):
+                return await fn(*args, **kwargs)
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with METRICS.track(fn.__name__, METRICS.doc_type(kwargs)):
+                return fn(*args, **kwargs)
+    return wrapper
+
+def uno_tool(fn=None, *, read_only: bool = False):
+    # Register fn as an async MCP tool whose blocking UNO work runs on the app's UnoExecutor.
+    # Tools that are not read_only bump the document revision used to key the export cache.
+    if fn is None:
+        return functools.partial(uno_tool, read_only=read_only)
+
+    def call(ctx: Context, **kwargs):
+        with TRACER.trace(fn.__name__, kwargs.get("doc_id")) as trace:
+            try:
+                result = fn(ctx, **kwargs)
+            finally:
+                if not read_only and kwargs.get("doc_id"):
+                    ctx.request_context.lifespan_context.bump_revision(kwargs["doc_id"])
+            if trace is not None:
+                trace.measure_encoding(result)
+                if TRACER.in_response and isinstance(result, dict):
+                    result["_trace"] = trace.summary(TRACER.top_n)
+        return result
+
+    @functools.wraps(fn)
+    async def wrapper(ctx: Context, **kwargs):
+        app_ctx = ctx.request_context.lifespan_context
+        return await app_ctx.executor.submit(app_ctx.lock_key(kwargs.get("doc_id")), call, ctx, **kwargs)
+    TOOLS[fn.__name__] = call
+    return mcp.tool()(instrumented(wrapper))
+
 def streamable_http_app():
     app = FastAPI()
     @app.post("/")
@@ -151,25 +2150,41 @@ def streamable_http_app():
             "result": {
                 "message": "LibreOffice plugin",
                 "tools": [
-                    "open_document", "new_document", "save_document", "close_document",
-                    "get_sheet_names", "get_cell_value", "set_cell_value", "create_new_sheet",
+                    "open_document", "open_document_bytes", "new_document", "save_document", "save_document_bytes", "get_job_status", "close_document", "convert_batch", "execute_batch",
+                    "get_sheet_names", "get_cell_value", "get_range_values", "set_cell_value", "set_range_values", "create_new_sheet",
                     "create_pivot_table", "sort_range", "calculate_statistics",
                     "format_cell_range", "conditional_format", "create_chart", "insert_form_control",
-                    "run_query", "list_tables", "create_table", "insert_data", "create_form", "create_report",
+                    "run_query", "fetch_query_page", "close_query_cursor", "list_tables", "create_table", "insert_data", "insert_rows", "create_form", "create_report",
                     "insert_text", "apply_style", "run_macro"
                 ],
                 "resources": []
             },
             "id": 1  # Static ID for simplicity; mcpo may require dynamic IDs
         }
+    @app.get("/metrics")
+    async def metrics():
+        return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/healthz")
+    async def healthz():
+        # Liveness: the server answers even while the watchdog is bringing an office back
+        app_ctx = METRICS.app_ctx
+        return JSONResponse(app_ctx.health() if app_ctx else {"status": "starting", "workers": []})
+
+    @app.get("/readyz")
+    async def readyz():
+        app_ctx = METRICS.app_ctx
+        health = app_ctx.health() if app_ctx else {"status": "starting", "workers": []}
+        return JSONResponse(health, status_code=200 if health["status"] == "ok" else 503)
+
     logger.info(f"{mcp.name} routes: {[f'{route.path} ({route.methods})' for route in app.routes]}")
     return app
 
 mcp.streamable_http_app = streamable_http_app
 
 # Core Document Management Tools
-@mcp.tool()
-def open_document(ctx: Context, url: str, doc_type: str) -> str:
+@uno_tool
+def open_document(ctx: Context, url: str, doc_type: str, shared: bool = False, mode: str = "edit") -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc_types = {
         "writer": WriteDoc,
@@ -180,20 +2195,35 @@ def open_document(ctx: Context, url: str, doc_type: str) -> str:
     }
     if doc_type not in doc_types:
         raise RuntimeError(f"Invalid document type. Use: {', '.join(doc_types.keys())}")
+    if mode not in ("edit", "read", "python"):
+        raise RuntimeError("Invalid mode. Use: edit, read, python")
+    if doc_type == "base" and mode != "edit":
+        raise RuntimeError("Base documents can only be opened in edit mode")
+    if mode == "python" and doc_type != "calc":
+        raise RuntimeError("Python mode is only available for calc documents")
+    path = url if doc_type == "base" else os.path.join(app_ctx.output_dir, url)
     try:
-        if doc_type == "base":
-            doc = Lo.open_doc(fnm=url, loader=app_ctx.loader)
+        if shared:
+            doc_class = (SpreadsheetReader, CalcDoc) if mode == "python" else doc_types[doc_type]
+            doc_id = app_ctx.open_shared(path, doc_class, mode)
+            if doc_id:
+                return doc_id
+        worker = None if mode == "python" else app_ctx.pick_worker()
+        if mode == "python":
+            doc = SpreadsheetReader(path)
+        elif doc_type == "base":
+            with TRACER.span("Lo.open_doc"):
+                doc = Lo.open_doc(fnm=path, loader=worker.loader)
         else:
-            doc_class = doc_types[doc_type]
-            doc = doc_class.from_path(fnm=os.path.join(app_ctx.output_dir, url), lo_inst=app_ctx.loader)
-        doc_id = f"doc_{app_ctx.next_id}"
-        app_ctx.next_id += 1
-        app_ctx.add_document(doc_id, doc)
+            doc = load_document(worker, path, doc_types[doc_type], mode)
+        doc_id = app_ctx.register_document(doc, worker, path)
+        if shared:
+            app_ctx.share_document(doc_id, path, mode)
         return doc_id
     except Exception as e:
         raise RuntimeError(f"Failed to open document: {str(e)}")
 
-@mcp.tool()
+@uno_tool
 def new_document(ctx: Context, doc_type: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc_types = {
@@ -206,71 +2236,303 @@ def new_document(ctx: Context, doc_type: str) -> str:
     if doc_type not in doc_types:
         raise RuntimeError(f"Invalid document type. Use: {', '.join(doc_types.keys())}")
     try:
-        if doc_type == "base":
-            doc = Lo.create_doc(doc_type="sbase", loader=app_ctx.loader)
+        prewarmed = app_ctx.take_prewarmed(doc_type)
+        if prewarmed:
+            doc, worker = prewarmed
+        elif doc_type == "base":
+            worker = app_ctx.pick_worker()
+            with TRACER.span("Lo.create_doc"):
+                doc = Lo.create_doc(doc_type="sbase", loader=worker.loader)
         else:
-            doc_class = doc_types[doc_type]
-            doc = doc_class.create_doc(lo_inst=app_ctx.loader)
-        doc_id = f"doc_{app_ctx.next_id}"
-        app_ctx.next_id += 1
-        app_ctx.add_document(doc_id, doc)
-        return doc_id
+            worker = app_ctx.pick_worker()
+            doc = create_blank_document(worker, doc_type)
+        return app_ctx.register_document(doc, worker)
     except Exception as e:
         raise RuntimeError(f"Failed to create new document: {str(e)}")
     
-@mcp.tool()
-def save_document(ctx: Context, doc_id: str, url: str) -> str:
+@uno_tool(read_only=True)
+def save_document(ctx: Context, doc_id: str, url: str, async_save: bool = False) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc:
         raise RuntimeError("Document not found")
+    target = os.path.join(app_ctx.output_dir, url)
+    if async_save:
+        job = app_ctx.find_queued_job("save", doc_id=doc_id, target=target)
+        if job is None:
+            job = app_ctx.create_job("save", doc_id=doc_id, target=target)
+            def save():
+                if app_ctx.get_document(doc_id, native=False) is not doc:
+                    raise RuntimeError(f"Document {doc_id} was closed before it could be saved")
+                cached = app_ctx.export_document(doc_id, doc, target, job["job_id"])
+                return f"Document saved to {url}" + (" (from export cache)" if cached else "")
+            app_ctx.submit_job(job, app_ctx.lock_key(doc_id), save)
+        return job["job_id"]
     try:
-        doc.save_doc(fnm=os.path.join(app_ctx.output_dir, url))
-        return f"Document saved to {url}"
+        cached = app_ctx.export_document(doc_id, doc, target, doc_id)
+        return f"Document saved to {url}" + (" (from export cache)" if cached else "")
     except Exception as e:
         raise RuntimeError(f"Failed to save document: {str(e)}")
 
 @mcp.tool()
+@instrumented
+def get_job_status(ctx: Context, job_id: str) -> Dict[str, Any]:
+    app_ctx = ctx.request_context.lifespan_context
+    job = app_ctx.jobs.get(job_id)
+    if not job:
+        raise RuntimeError(f"Job {job_id} not found")
+    return dict(job)
+
+@uno_tool
 def close_document(ctx: Context, doc_id: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
-    doc = app_ctx.get_document(doc_id)
+    doc = app_ctx.get_document(doc_id, native=False)
     if not doc:
         raise RuntimeError("Document not found")
     try:
-        doc.close_doc()
-        app_ctx.remove_document(doc_id)
+        app_ctx.close_document(doc_id)
         return f"Document {doc_id} closed"
     except Exception as e:
         raise RuntimeError(f"Failed to close document: {str(e)}")
 
-# Calc (Spreadsheet) Tools
+@uno_tool
+def execute_batch(ctx: Context, doc_id: str, operations: List[Dict[str, Any]], stop_on_error: bool = True, undo_title: str = "MCP batch") -> Dict[str, Any]:
+    app_ctx = ctx.request_context.lifespan_context
+    doc = app_ctx.get_document(doc_id)
+    if not doc:
+        raise RuntimeError("Document not found")
+    excluded = {"execute_batch", "open_document", "new_document", "close_document"}
+    for index, op in enumerate(operations):
+        tool = op.get("tool")
+        if tool not in TOOLS or tool in excluded:
+            raise RuntimeError(f"Operation {index}: unsupported tool '{tool}'")
+        if op.get("args", {}).get("doc_id", doc_id) != doc_id:
+            raise RuntimeError(f"Operation {index}: all operations must target {doc_id}")
+    component = getattr(doc, "component", doc)
+    try:
+        undo_manager = component.getUndoManager()
+    except AttributeError:
+        undo_manager = None
+    results = []
+    started = time.perf_counter()
+    app_ctx.batch_state.sheets = {}
+    component.lockControllers()
+    if undo_manager is not None:
+        undo_manager.enterUndoContext(undo_title)
+    try:
+        for index, op in enumerate(operations):
+            args = {**op.get("args", {}), "doc_id": doc_id}
+            op_started = time.perf_counter()
+            entry = {"index": index, "tool": op["tool"]}
+            try:
+                entry["result"] = TOOLS[op["tool"]](ctx, **args)
+                entry["ok"] = True
+            except Exception as e:
+                entry["error"] = str(e)
+                entry["ok"] = False
+            entry["elapsed_ms"] = round((time.perf_counter() - op_started) * 1000, 3)
+            results.append(entry)
+            if not entry["ok"] and stop_on_error:
+                break
+    finally:
+        if undo_manager is not None:
+            undo_manager.leaveUndoContext()
+        component.unlockControllers()
+        app_ctx.batch_state.sheets = None
+    return {
+        "completed": sum(1 for entry in results if entry["ok"]),
+        "failed": sum(1 for entry in results if not entry["ok"]),
+        "skipped": len(operations) - len(results),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "results": results
+    }
+
+@uno_tool
+def open_document_bytes(ctx: Context, data: str, doc_type: str, filter_name: str = "", mode: str = "edit") -> str:
+    app_ctx = ctx.request_context.lifespan_context
+    doc_types = {
+        "writer": WriteDoc,
+        "calc": CalcDoc,
+        "draw": DrawDoc,
+        "impress": DrawDoc
+    }
+    if doc_type not in doc_types:
+        raise RuntimeError(f"Invalid document type. Use: {', '.join(doc_types.keys())}")
+    if mode not in ("edit", "read"):
+        raise RuntimeError("Invalid mode. Use: edit, read")
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except ValueError as e:
+        raise RuntimeError(f"Invalid base64 data: {str(e)}")
+    if len(raw) > app_ctx.max_stream_bytes:
+        raise RuntimeError(f"Document is larger than {app_ctx.max_stream_bytes} bytes")
+    from com.sun.star.io import XInputStream
+    worker = app_ctx.pick_worker()
+    try:
+        stream = worker.lo_inst.create_instance_mcf(XInputStream, "com.sun.star.io.SequenceInputStream", args=(uno.ByteSequence(raw),), raise_err=True)
+        props = {"InputStream": stream, "Hidden": True}
+        if mode == "read":
+            props["ReadOnly"] = True
+        if filter_name:
+            props["FilterName"] = filter_name
+        # Under the load lock, so a Calc stream never loads inside another load's recalc-on-load override
+        with worker.load_lock, TRACER.span("Loader.loadComponentFromURL"):
+            component = worker.loader.loadComponentFromURL("private:stream", "_blank", 0, make_props(**props))
+        if component is None:
+            raise RuntimeError("The office could not load the stream")
+        doc = doc_types[doc_type](doc=component, lo_inst=worker.lo_inst)
+        return app_ctx.register_document(doc, worker, size=len(raw))
+    except Exception as e:
+        raise RuntimeError(f"Failed to open document: {str(e)}")
+
+@uno_tool(read_only=True)
+def save_document_bytes(ctx: Context, doc_id: str, target_format: str = "", filter_name: str = "") -> Dict[str, Any]:
+    app_ctx = ctx.request_context.lifespan_context
+    doc = app_ctx.get_document(doc_id)
+    if not doc:
+        raise RuntimeError("Document not found")
+    from com.sun.star.io import XOutputStream
+    component = TRACER.wrap(doc.component, "Document")
+    if not filter_name:
+        kind = component_kind(component)
+        filter_name = EXPORT_FILTERS.get(target_format, {}).get(kind) if target_format else NATIVE_FILTERS[kind]
+        if not filter_name:
+            raise RuntimeError(f"No {target_format} export filter for {kind} documents")
+    try:
+        # SequenceOutputStream buffers inside the office, so the whole export comes back in one call
+        stream = app_ctx.worker_for(doc_id).lo_inst.create_instance_mcf(XOutputStream, "com.sun.star.io.SequenceOutputStream", raise_err=True)
+        component.storeToURL("private:stream", make_props(FilterName=filter_name, OutputStream=stream))
+        raw = stream.getWrittenBytes().value
+        stream.closeOutput()
+    except Exception as e:
+        raise RuntimeError(f"Failed to save document: {str(e)}")
+    return {
+        "filter": filter_name,
+        "size": len(raw),
+        "data": base64.b64encode(raw).decode("ascii")
+    }
+
 @mcp.tool()
+@instrumented
+async def convert_batch(ctx: Context, target_format: str, paths: List[str] | None = None, pattern: str = "", filter_name: str = "", output_subdir: str = "converted") -> Dict[str, Any]:
+    app_ctx = ctx.request_context.lifespan_context
+    if not filter_name and target_format not in EXPORT_FILTERS:
+        raise RuntimeError(f"Invalid target format. Use: {', '.join(EXPORT_FILTERS.keys())} or pass filter_name")
+    # target_format becomes the output file extension, so it must not carry a path
+    if not re.fullmatch(r"[A-Za-z0-9_+-]+", target_format):
+        raise RuntimeError(f"Invalid target format '{target_format}'")
+    if bool(paths) == bool(pattern):
+        raise RuntimeError("Provide exactly one of paths or pattern")
+    root = os.path.realpath(app_ctx.output_dir)
+    candidates = paths or sorted(glob.glob(pattern, root_dir=root, recursive=True))
+    sources = []
+    for path in candidates:
+        source = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, source]) != root:
+            raise RuntimeError(f"Path '{path}' is outside the output directory")
+        if os.path.isfile(source) and source not in sources:
+            sources.append(source)
+    output_root = os.path.realpath(os.path.join(root, output_subdir))
+    if os.path.commonpath([root, output_root]) != root:
+        raise RuntimeError(f"Output directory '{output_subdir}' is outside the output directory")
+    targets = {source: os.path.realpath(os.path.join(output_root, f"{os.path.splitext(os.path.relpath(source, root))[0]}.{target_format}")) for source in sources}
+    for source, target in targets.items():
+        if os.path.commonpath([output_root, target]) != output_root:
+            raise RuntimeError(f"Output for '{os.path.relpath(source, root)}' is outside the output directory")
+    # a.docx and a.xlsx both map to a.pdf; fail them up front instead of letting one silently overwrite the other
+    by_target = {}
+    for source, target in targets.items():
+        by_target.setdefault(target, []).append(os.path.relpath(source, root))
+    results = [
+        {"path": relative, "ok": False, "error": f"Output {os.path.relpath(target, root)} would also be written by {', '.join(other for other in clashing if other != relative)}"}
+        for target, clashing in by_target.items() if len(clashing) > 1 for relative in clashing
+    ]
+    results += [
+        {"path": os.path.relpath(source, root), "ok": False, "error": f"Output {os.path.relpath(target, root)} would overwrite a source file"}
+        for source, target in targets.items() if len(by_target[target]) == 1 and target in targets
+    ]
+    pending = [source for source in sources if len(by_target[targets[source]]) == 1 and targets[source] not in targets]
+    live_workers = {worker for worker in app_ctx.workers if worker.usable}
+    if pending and not live_workers:
+        raise RuntimeError("No LibreOffice worker is available; all offices are down or restarting")
+    free_workers = asyncio.Queue()
+    for worker in live_workers:
+        free_workers.put_nowait(worker)
+    started = time.perf_counter()
+
+    async def take_worker() -> OfficeWorker:
+        # Workers that die mid-batch are dropped; the last one is passed on so no waiter blocks forever
+        while live_workers:
+            worker = await free_workers.get()
+            if worker.usable:
+                return worker
+            live_workers.discard(worker)
+            if not live_workers:
+                free_workers.put_nowait(worker)
+        raise RuntimeError("No LibreOffice worker is available; all offices are down or restarting")
+
+    async def convert(source: str):
+        relative = os.path.relpath(source, root)
+        target = targets[source]
+        worker = None
+        try:
+            worker = await take_worker()
+            outcome = await app_ctx.executor.submit(None, convert_file, worker, source, target, target_format, filter_name)
+            entry = {"path": relative, "ok": True, "output": os.path.relpath(target, root), **outcome}
+        except Exception as e:
+            entry = {"path": relative, "ok": False, "error": str(e)}
+        finally:
+            if worker is not None:
+                free_workers.put_nowait(worker)
+        results.append(entry)
+        await ctx.report_progress(len(results), len(sources))
+        await ctx.info(f"{relative}: {'converted' if entry['ok'] else 'failed: ' + entry['error']} ({len(results)}/{len(sources)})")
+
+    await asyncio.gather(*(convert(source) for source in pending))
+    return {
+        "total": len(sources),
+        "converted": sum(1 for entry in results if entry["ok"]),
+        "failed": sum(1 for entry in results if not entry["ok"]),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "results": sorted(results, key=lambda entry: entry["path"])
+    }
+
+# Calc (Spreadsheet) Tools
+@uno_tool(read_only=True)
 def get_sheet_names(ctx: Context, doc_id: str) -> List[str]:
     app_ctx = ctx.request_context.lifespan_context
-    doc = app_ctx.get_document(doc_id)
+    doc = app_ctx.get_document(doc_id, native=False)
+    if isinstance(doc, SpreadsheetReader):
+        return doc.sheet_names()
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    return doc.get_sheet_names()
+    return TRACER.wrap_helper(doc).get_sheet_names()
 
-@mcp.tool()
+@uno_tool(read_only=True)
 def get_cell_value(ctx: Context, doc_id: str, sheet_name: str, cell_address: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
-    doc = app_ctx.get_document(doc_id)
+    doc = app_ctx.get_document(doc_id, native=False)
+    if isinstance(doc, SpreadsheetReader):
+        try:
+            value = doc.get_range(sheet_name, cell_address)[0][0]
+            return "" if value == "" else str(value)
+        except RecalcRequired as e:
+            doc = app_ctx.promote_document(doc_id, str(e))
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    sheet = doc.sheets.get_by_name(sheet_name)
+    sheet = app_ctx.get_sheet(doc, sheet_name)
     cell = sheet[cell_address]
     if cell.is_empty():
         return ""
     return str(cell.value)
 
-@mcp.tool()
+@uno_tool
 def set_cell_value(ctx: Context, doc_id: str, sheet_name: str, cell_address: str, value: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    sheet = doc.sheets.get_by_name(sheet_name)
+    sheet = app_ctx.get_sheet(doc, sheet_name)
     try:
         cell = sheet[cell_address]
         cell.value = float(value)
@@ -278,23 +2540,122 @@ def set_cell_value(ctx: Context, doc_id: str, sheet_name: str, cell_address: str
         cell.value = value
     return f"Set {cell_address} to {value}"
 
-@mcp.tool()
+@uno_tool(read_only=True)
+def get_range_values(ctx: Context, doc_id: str, sheet_name: str, range_address: str, formulas: bool = False, row_offset: int = 0, row_limit: int = 0, col_offset: int = 0, col_limit: int = 0) -> Dict[str, Any]:
+    app_ctx = ctx.request_context.lifespan_context
+    if min(row_offset, row_limit, col_offset, col_limit) < 0:
+        raise RuntimeError("Offsets and limits must be non-negative")
+    doc = app_ctx.get_document(doc_id, native=False)
+    if isinstance(doc, SpreadsheetReader):
+        try:
+            if formulas:
+                raise RecalcRequired("formula text is only available from LibreOffice")
+            data = doc.get_range(sheet_name, range_address)
+            total_rows = len(data)
+            total_cols = len(data[0])
+            rows = data[row_offset:row_offset + row_limit] if row_limit else data[row_offset:]
+            return {
+                "range": range_address,
+                "total_rows": total_rows,
+                "total_columns": total_cols,
+                "row_offset": row_offset,
+                "col_offset": col_offset,
+                "values": [list(row[col_offset:col_offset + col_limit] if col_limit else row[col_offset:]) for row in rows] if col_offset < total_cols else []
+            }
+        except RecalcRequired as e:
+            doc = app_ctx.promote_document(doc_id, str(e))
+    if not doc or not isinstance(doc, CalcDoc):
+        raise RuntimeError("Document is not a spreadsheet")
+    sheet = app_ctx.get_sheet(doc, sheet_name)
+    cell_range = TRACER.wrap(sheet.component, "Sheet").getCellRangeByName(range_address)
+    addr = cell_range.getRangeAddress()
+    total_rows = addr.EndRow - addr.StartRow + 1
+    total_cols = addr.EndColumn - addr.StartColumn + 1
+    rows = min(row_limit or total_rows, total_rows - row_offset)
+    cols = min(col_limit or total_cols, total_cols - col_offset)
+    values = []
+    if rows > 0 and cols > 0:
+        if (rows, cols) != (total_rows, total_cols):
+            cell_range = TRACER.wrap(sheet.component, "Sheet").getCellRangeByPosition(
+                addr.StartColumn + col_offset,
+                addr.StartRow + row_offset,
+                addr.StartColumn + col_offset + cols - 1,
+                addr.StartRow + row_offset + rows - 1
+            )
+        data = cell_range.getFormulaArray() if formulas else cell_range.getDataArray()
+        values = [list(row) for row in data]
+    return {
+        "range": range_address,
+        "total_rows": total_rows,
+        "total_columns": total_cols,
+        "row_offset": row_offset,
+        "col_offset": col_offset,
+        "values": values
+    }
+
+@uno_tool
+def set_range_values(ctx: Context, doc_id: str, sheet_name: str, start_cell: str, values: List[List[Any]] | None = None, csv_data: str = "", ndjson_data: str = "", formulas: bool = False) -> str:
+    app_ctx = ctx.request_context.lifespan_context
+    doc = app_ctx.get_document(doc_id)
+    if not doc or not isinstance(doc, CalcDoc):
+        raise RuntimeError("Document is not a spreadsheet")
+    if sum(1 for payload in (values, csv_data, ndjson_data) if payload) != 1:
+        raise RuntimeError("Provide exactly one of values, csv_data or ndjson_data")
+    if csv_data:
+        rows = [list(row) for row in csv.reader(io.StringIO(csv_data))]
+    elif ndjson_data:
+        records = [json.loads(line) for line in ndjson_data.splitlines() if line.strip()]
+        # Union of keys across all records, so keys that first appear in a later record still get a column
+        header = list(dict.fromkeys(key for record in records if isinstance(record, dict) for key in record))
+        rows = []
+        header_written = False
+        for record in records:
+            if isinstance(record, dict):
+                if not header_written:
+                    rows.append(header)
+                    header_written = True
+                rows.append([record.get(key, "") for key in header])
+            else:
+                rows.append(list(record))
+    else:
+        rows = [list(row) for row in values]
+    if not rows:
+        raise RuntimeError("No values to write")
+    width = max(len(row) for row in rows)
+    if width == 0:
+        raise RuntimeError("No values to write")
+    if formulas:
+        data = tuple(tuple(str(v) if v is not None else "" for v in row) + ("",) * (width - len(row)) for row in rows)
+    else:
+        data = tuple(tuple("" if v is None else parse_numeric(v) for v in row) + ("",) * (width - len(row)) for row in rows)
+    col, row = parse_cell_address(start_cell)
+    sheet = app_ctx.get_sheet(doc, sheet_name)
+    with bulk_update(doc):
+        cell_range = TRACER.wrap(sheet.component, "Sheet").getCellRangeByPosition(col, row, col + width - 1, row + len(data) - 1)
+        if formulas:
+            cell_range.setFormulaArray(data)
+        else:
+            cell_range.setDataArray(data)
+    return f"Wrote {len(data)}x{width} values starting at {start_cell}"
+
+@uno_tool
 def create_new_sheet(ctx: Context, doc_id: str, sheet_name: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    doc.sheets.insert_new_by_name(sheet_name, len(doc.get_sheet_names()))
+    traced = TRACER.wrap_helper(doc)
+    traced.sheets.insert_new_by_name(sheet_name, len(traced.get_sheet_names()))
     return f"Created new sheet '{sheet_name}'"
 
 # Data Analysis Tools (Calc)
-@mcp.tool()
+@uno_tool
 def create_pivot_table(ctx: Context, doc_id: str, sheet_name: str, source_range: str, target_cell: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    sheet = doc.sheets.get_by_name(sheet_name)
+    sheet = app_ctx.get_sheet(doc, sheet_name)
     tbl_chart = sheet.charts.insert_chart(
         rng_obj=sheet.rng(source_range),
         cell_name=target_cell,
@@ -304,13 +2665,13 @@ def create_pivot_table(ctx: Context, doc_id: str, sheet_name: str, source_range:
     )
     return f"Created pivot table at {target_cell}"
 
-@mcp.tool()
+@uno_tool
 def sort_range(ctx: Context, doc_id: str, sheet_name: str, range_address: str, sort_column: int, ascending: bool) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    sheet = doc.sheets.get_by_name(sheet_name)
+    sheet = app_ctx.get_sheet(doc, sheet_name)
     rng = sheet.rng(range_address)
     from com.sun.star.util import SortField
     sort_field = SortField()
@@ -319,145 +2680,288 @@ def sort_range(ctx: Context, doc_id: str, sheet_name: str, range_address: str, s
     rng.sort([sort_field])
     return f"Sorted range {range_address} by column {sort_column} {'ascending' if ascending else 'descending'}"
 
-@mcp.tool()
-def calculate_statistics(ctx: Context, doc_id: str, sheet_name: str, range_address: str) -> Dict[str, float]:
+@uno_tool(read_only=True)
+def calculate_statistics(ctx: Context, doc_id: str, sheet_name: str, range_address: str, percentiles: List[float] | None = None) -> Dict[str, Any]:
     app_ctx = ctx.request_context.lifespan_context
-    doc = app_ctx.get_document(doc_id)
+    percentiles = percentiles or [25.0, 50.0, 75.0]
+    if any(p < 0 or p > 100 for p in percentiles):
+        raise RuntimeError("Percentiles must be between 0 and 100")
+    doc = app_ctx.get_document(doc_id, native=False)
+    if isinstance(doc, SpreadsheetReader):
+        try:
+            return summarize_values(doc.get_range(sheet_name, range_address), percentiles)
+        except RecalcRequired as e:
+            doc = app_ctx.promote_document(doc_id, str(e))
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    sheet = doc.sheets.get_by_name(sheet_name)
-    rng = sheet.rng(range_address)
-    values = [cell.value for cell in rng if isinstance(cell.value, (int, float))]
-    if not values:
-        return {"sum": 0.0, "average": 0.0}
-    total = sum(values)
-    average = total / len(values)
-    return {"sum": total, "average": average}
+    sheet = app_ctx.get_sheet(doc, sheet_name)
+    data = TRACER.wrap(sheet.component, "Sheet").getCellRangeByName(range_address).getDataArray()
+    return summarize_values(data, percentiles)
+
+def summarize_values(data, percentiles: List[float]) -> Dict[str, Any]:
+    cells = np.array(data, dtype=object).reshape(len(data), -1) if data else np.empty((0, 1), dtype=object)
+    is_number = np.frompyfunc(lambda v: isinstance(v, (int, float)) and not isinstance(v, bool), 1, 1)(cells).astype(bool)
+    is_empty = (cells == "") | np.frompyfunc(lambda v: v is None, 1, 1)(cells).astype(bool)
+    numbers = np.where(is_number, cells, np.nan).astype(np.float64)
+    result = column_statistics(numbers.reshape(-1, 1), is_empty.reshape(-1, 1), percentiles)[0]
+    if numbers.shape[1] > 1:
+        result["columns"] = column_statistics(numbers, is_empty, percentiles)
+    return result
+
+def column_statistics(numbers, is_empty, percentiles: List[float]) -> List[Dict[str, Any]]:
+    def clean(value):
+        value = float(value)
+        return None if np.isnan(value) else value
+
+    count = np.count_nonzero(~np.isnan(numbers), axis=0)
+    nulls = np.count_nonzero(is_empty, axis=0)
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        total = np.nansum(numbers, axis=0)
+        mean = np.nanmean(numbers, axis=0)
+        minimum = np.nanmin(numbers, axis=0) if numbers.shape[0] else np.full(numbers.shape[1], np.nan)
+        maximum = np.nanmax(numbers, axis=0) if numbers.shape[0] else np.full(numbers.shape[1], np.nan)
+        median = np.nanmedian(numbers, axis=0)
+        stddev = np.nanstd(numbers, axis=0, ddof=1)
+        variance = np.nanvar(numbers, axis=0, ddof=1)
+        pct = np.nanpercentile(numbers, percentiles, axis=0) if numbers.shape[0] else np.full((len(percentiles), numbers.shape[1]), np.nan)
+    stats = []
+    for i in range(numbers.shape[1]):
+        stats.append({
+            "count": int(count[i]),
+            "null_count": int(nulls[i]),
+            "text_count": int(numbers.shape[0] - count[i] - nulls[i]),
+            "sum": float(total[i]),
+            "average": clean(mean[i]) if count[i] else 0.0,
+            "min": clean(minimum[i]),
+            "max": clean(maximum[i]),
+            "median": clean(median[i]),
+            "stddev": clean(stddev[i]),
+            "variance": clean(variance[i]),
+            "percentiles": {f"p{p:g}": clean(pct[j][i]) for j, p in enumerate(percentiles)}
+        })
+    return stats
 
 # Base (Database) Tools
-@mcp.tool()
-def run_query(ctx: Context, doc_id: str, sql: str, username: str = "", password: str = "") -> List[Dict[str, str]] | str:
+@uno_tool
+def run_query(ctx: Context, doc_id: str, sql: str, username: str = "", password: str = "", page_size: int = 0) -> List[Dict[str, str]] | Dict[str, Any] | str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc:
         raise RuntimeError("Document not found")
-    data_source = doc.getDataSource()
-    connection = data_source.getConnection(username, password)
-    statement = connection.createStatement()
-    if sql.lower().strip().startswith("select"):
-        result_set = statement.executeQuery(sql)
-        meta_data = result_set.getMetaData()
-        column_count = meta_data.getColumnCount()
-        results = []
-        while result_set.next():
-            row = {}
-            for i in range(1, column_count + 1):
-                row[meta_data.getColumnName(i)] = result_set.getString(i)
-            results.append(row)
-        return results
-    else:
-        affected_rows = statement.executeUpdate(sql)
-        return f"Affected {affected_rows} rows"
+    is_select = sql.lower().strip().startswith("select")
+    if is_select and page_size > 0:
+        cursor = app_ctx.open_cursor(doc_id, sql, username, password, page_size)
+        with cursor.lock:
+            rows = cursor.fetch(page_size)
+        if cursor.exhausted:
+            app_ctx.close_cursor(cursor.cursor_id)
+        return cursor.page(rows)
+    with app_ctx.get_db_pool(doc_id).connection(username, password) as connection:
+        statement = connection.createStatement()
+        try:
+            if is_select:
+                result_set = statement.executeQuery(sql)
+                meta_data = result_set.getMetaData()
+                names = [meta_data.getColumnName(i) for i in range(1, meta_data.getColumnCount() + 1)]
+                results = []
+                while result_set.next():
+                    results.append({name: result_set.getString(i) for i, name in enumerate(names, start=1)})
+                result_set.close()
+                return results
+            else:
+                affected_rows = statement.executeUpdate(sql)
+                return f"Affected {affected_rows} rows"
+        finally:
+            statement.close()
 
-@mcp.tool()
+@uno_tool(read_only=True)
+def fetch_query_page(ctx: Context, doc_id: str, cursor_id: str, page_size: int = 0) -> Dict[str, Any]:
+    app_ctx = ctx.request_context.lifespan_context
+    cursor = app_ctx.get_cursor(doc_id, cursor_id)
+    with cursor.lock:
+        if cursor.result_set is None:
+            raise RuntimeError(f"Cursor {cursor_id} not found or expired")
+        rows = cursor.fetch(page_size if page_size > 0 else cursor.page_size)
+    if cursor.exhausted:
+        app_ctx.close_cursor(cursor_id)
+    return cursor.page(rows)
+
+@uno_tool(read_only=True)
+def close_query_cursor(ctx: Context, doc_id: str, cursor_id: str) -> str:
+    app_ctx = ctx.request_context.lifespan_context
+    app_ctx.get_cursor(doc_id, cursor_id)
+    app_ctx.close_cursor(cursor_id)
+    return f"Cursor {cursor_id} closed"
+
+@uno_tool(read_only=True)
 def list_tables(ctx: Context, doc_id: str) -> List[str]:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc:
         raise RuntimeError("Document not found")
-    data_source = doc.getDataSource()
-    connection = data_source.getConnection("", "")
-    meta_data = connection.getMetaData()
-    result_set = meta_data.getTables(None, None, "%", None)
-    tables = []
-    while result_set.next():
-        tables.append(result_set.getString(3))
+    with app_ctx.get_db_pool(doc_id).connection() as connection:
+        meta_data = connection.getMetaData()
+        result_set = meta_data.getTables(None, None, "%", None)
+        tables = []
+        while result_set.next():
+            tables.append(result_set.getString(3))
+        result_set.close()
     return tables
 
-@mcp.tool()
+@uno_tool
 def create_table(ctx: Context, doc_id: str, table_name: str, columns: List[Dict[str, str]]) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc:
         raise RuntimeError("Document not found")
-    data_source = doc.getDataSource()
-    connection = data_source.getConnection("", "")
-    statement = connection.createStatement()
     column_defs = ", ".join(f"{col['name']} {col['type']}" for col in columns)
     sql = f"CREATE TABLE {table_name} ({column_defs})"
-    statement.executeUpdate(sql)
+    with app_ctx.get_db_pool(doc_id).connection() as connection:
+        statement = connection.createStatement()
+        try:
+            statement.executeUpdate(sql)
+        finally:
+            statement.close()
     return f"Created table '{table_name}'"
 
-@mcp.tool()
+@uno_tool
 def insert_data(ctx: Context, doc_id: str, table_name: str, data: Dict[str, str]) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc:
         raise RuntimeError("Document not found")
-    data_source = doc.getDataSource()
-    connection = data_source.getConnection("", "")
-    statement = connection.createStatement()
     columns = ", ".join(data.keys())
     values = ", ".join([f"'{v}'" if isinstance(v, str) else str(v) for v in data.values()])
     sql = f"INSERT INTO {table_name} ({columns}) VALUES ({values})"
-    affected_rows = statement.executeUpdate(sql)
+    with app_ctx.get_db_pool(doc_id).connection() as connection:
+        statement = connection.createStatement()
+        try:
+            affected_rows = statement.executeUpdate(sql)
+        finally:
+            statement.close()
     return f"Inserted {affected_rows} row(s) into '{table_name}'"
 
-@mcp.tool()
+@uno_tool
+def insert_rows(ctx: Context, doc_id: str, table_name: str, columns: List[str], rows: List[List[Any]], commit_interval: int = 1000) -> Dict[str, Any]:
+    app_ctx = ctx.request_context.lifespan_context
+    doc = app_ctx.get_document(doc_id)
+    if not doc:
+        raise RuntimeError("Document not found")
+    if not columns:
+        raise RuntimeError("No columns given")
+    if commit_interval <= 0:
+        raise RuntimeError("commit_interval must be positive")
+    for index, row in enumerate(rows):
+        if len(row) != len(columns):
+            raise RuntimeError(f"Row {index} has {len(row)} values, expected {len(columns)}")
+    column_list = ", ".join(check_identifier(column) for column in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    sql = f"INSERT INTO {check_identifier(table_name)} ({column_list}) VALUES ({placeholders})"
+    started = time.perf_counter()
+    committed = 0
+    commits = 0
+    with app_ctx.get_db_pool(doc_id).connection() as connection:
+        # Embedded Firebird, among others, has no batch support; fall back to one executeUpdate per row there
+        try:
+            batched = bool(connection.getMetaData().supportsBatchUpdates())
+        except Exception:
+            batched = False
+        auto_commit = connection.getAutoCommit()
+        connection.setAutoCommit(False)
+        statement = connection.prepareStatement(sql)
+        try:
+            for start in range(0, len(rows), commit_interval):
+                chunk = rows[start:start + commit_interval]
+                counts = []
+                for row in chunk:
+                    for i, value in enumerate(row, start=1):
+                        bind_parameter(statement, i, value)
+                    if batched:
+                        statement.addBatch()
+                    else:
+                        counts.append(statement.executeUpdate())
+                if batched:
+                    counts = list(statement.executeBatch())
+                if len(counts) != len(chunk) or any(count == BATCH_EXECUTE_FAILED for count in counts):
+                    raise RuntimeError(f"Driver reported a failed statement in the batch starting at row {start}")
+                connection.commit()
+                commits += 1
+                # SUCCESS_NO_INFO (-2) means the statement ran but the driver did not count the rows
+                committed += sum(1 if count == BATCH_SUCCESS_NO_INFO else count for count in counts)
+        except Exception as e:
+            connection.rollback()
+            raise RuntimeError(f"Failed to insert rows into '{table_name}' after committing {committed} row(s): {str(e)}")
+        finally:
+            statement.close()
+            connection.setAutoCommit(auto_commit)
+    elapsed = time.perf_counter() - started
+    return {
+        "table": table_name,
+        "rows": committed,
+        "commits": commits,
+        "batched": batched,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_sec": round(committed / elapsed, 1) if elapsed > 0 else None
+    }
+
+@uno_tool
 def create_form(ctx: Context, doc_id: str, table_name: str, form_name: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc:
         raise RuntimeError("Document not found")
-    forms = Forms(doc=doc)
+    forms = TRACER.wrap_helper(Forms(doc=doc))
     form = forms.insert_form(name=form_name)
     form.setPropertyValue("ContentType", "Table")
     form.setPropertyValue("Command", table_name)
     return f"Created form '{form_name}' linked to table '{table_name}'"
 
-@mcp.tool()
+@uno_tool
 def create_report(ctx: Context, doc_id: str, table_name: str, report_name: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc:
         raise RuntimeError("Document not found")
-    report_designer = Lo.create_instance_mcf("com.sun.star.report.pentaho.SOReportJobFactory", loader=app_ctx.loader)
+    report_designer = Lo.create_instance_mcf("com.sun.star.report.pentaho.SOReportJobFactory", loader=app_ctx.worker_for(doc_id).loader)
     report = report_designer.createReport()
     report.setPropertyValue("Command", table_name)
     report.setPropertyValue("Caption", report_name)
     return f"Created report '{report_name}' based on table '{table_name}'"
 
 # Writer Tools
-@mcp.tool()
+@uno_tool
 def insert_text(ctx: Context, doc_id: str, text: str, position: int) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc or not isinstance(doc, WriteDoc):
         raise RuntimeError("Document is not a text document")
-    cursor = doc.get_cursor()
-    total_length = len(Write.get_text_string(cursor))
-    if position < 0 or position > total_length:
-        raise RuntimeError(f"Position {position} out of range (0-{total_length})")
-    cursor.goto_start(False)
-    cursor.go_right(position, False)
-    Write.append(cursor, text)
+    index = app_ctx.get_text_index(doc_id, doc, position)
+    cursor = index.cursor_at(position)
+    index.text.insertString(cursor, text, False)
+    if "\n" in text or "\r" in text:
+        app_ctx.invalidate_text_index(doc_id)
+    else:
+        index.grow(position, len(text))
     return f"Inserted '{text}' at position {position}"
 
-@mcp.tool()
+@uno_tool
 def apply_style(ctx: Context, doc_id: str, style_name: str, start: int, end: int) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc or not isinstance(doc, WriteDoc):
         raise RuntimeError("Document is not a text document")
-    cursor = doc.get_cursor()
-    cursor.goto_start(False)
-    cursor.go_right(start, False)
-    cursor.go_right(end - start, True)
-    Write.style(cursor, style_name)
+    if end < start:
+        raise RuntimeError(f"End position {end} is before start position {start}")
+    app_ctx.get_text_index(doc_id, doc, start)
+    index = app_ctx.get_text_index(doc_id, doc, end)
+    cursor = index.cursor_at(start)
+    cursor.gotoRange(index.cursor_at(end).getStart(), True)
+    cursor.setPropertyValue("ParaStyleName", style_name)
     return f"Applied style '{style_name}' to text from position {start} to {end}"
 
 # Additional Tools
-@mcp.tool()
+@uno_tool
 def run_macro(ctx: Context, doc_id: str, macro_name: str) -> str:
     from ooodev.macro.macro_loader import MacroLoader
     app_ctx = ctx.request_context.lifespan_context
@@ -467,15 +2971,16 @@ def run_macro(ctx: Context, doc_id: str, macro_name: str) -> str:
     with MacroLoader():
         script = doc.getScriptProvider().getScript(f"vnd.sun.star.script:{macro_name}?language=Python&location=document")
         script.invoke((), (), ())
+    app_ctx.invalidate_text_index(doc_id)
     return f"Executed macro '{macro_name}'"
 
-@mcp.tool()
+@uno_tool
 def insert_form_control(ctx: Context, doc_id: str, sheet_name: str, cell_address: str, control_type: str, label: str) -> str:
     app_ctx = ctx.request_context.lifespan_context
     doc = app_ctx.get_document(doc_id)
     if not doc or not isinstance(doc, CalcDoc):
         raise RuntimeError("Document is not a spreadsheet")
-    sheet = doc.sheets.get_by_name(sheet_name)
+    sheet = app_ctx.get_sheet(doc, sheet_name)
     cell = sheet[cell_address]
     control_types = {
         "checkbox": Forms.insert_control_check_box,
@@ -484,20 +2989,21 @@ def insert_form_control(ctx: Context, doc_id: str, sheet_name: str, cell_address
     }
     if control_type not in control_types:
         raise RuntimeError(f"Invalid control type. Use: {', '.join(control_types.keys())}")
-    control = control_types[control_type](cell=cell, label=label)
+    with TRACER.span(f"Forms.{control_types[control_type].__name__}"):
+        control = control_types[control_type](cell=unwrap_uno(cell), label=label)
     return f"Inserted {control_type} control '{label}' at {cell_address}"
 
-@mcp.tool()
+@uno_tool
 def format_cell_range(ctx: Context, doc_id: str, sheet_name: str, range_address: str, font_name: str = "Arial", font_size: int = 12, bold: bool = False, italic: bool = False, alignment: str = "center") -> str:
     app_ctx = ctx.request_context.lifespan_context
     return app_ctx.format_cell_range(doc_id, sheet_name, range_address, font_name, font_size, bold, italic, alignment)
 
-@mcp.tool()
+@uno_tool
 def conditional_format(ctx: Context, doc_id: str, sheet_name: str, range_address: str, threshold: float, above_color: str = "#FF0000", below_color: str = "#00FF00") -> str:
     app_ctx = ctx.request_context.lifespan_context
     return app_ctx.conditional_format(doc_id, sheet_name, range_address, threshold, above_color, below_color)
 
-@mcp.tool()
+@uno_tool
 def create_chart(ctx: Context, doc_id: str, sheet_name: str, range_address: str, target_cell: str, chart_type: str, title: str = "", x_label: str = "", y_label: str = "", show_legend: bool = True, show_data_labels: bool = False) -> str:
     app_ctx = ctx.request_context.lifespan_context
     return app_ctx.create_chart(doc_id, sheet_name, range_address, target_cell, chart_type, title, x_label, y_label, show_legend, show_data_labels)
@@ -0,0 +1,14 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+try:
+    import ooodev  # noqa: F401
+    import uno  # noqa: F401
+except ImportError:
+    # The tests exercise pure-Python code paths; the benchmark fake lets libreoffice import without an office
+    import fake_office
+
+    fake_office.install()
@@ -0,0 +1,121 @@
+import zipfile
+
+import pytest
+
+from libreoffice import SpreadsheetReader, RecalcRequired
+
+ODS_CONTENT = """<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content
+    xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+    xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+    xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+  <office:body>
+    <office:spreadsheet>
+      <table:table table:name="Data">
+        <table:table-row>
+          <table:table-cell office:value-type="string"><text:p>a<text:s text:c="2"/>b</text:p></table:table-cell>
+          <table:table-cell office:value-type="string"><text:p>x<text:tab/>y<text:line-break/>z</text:p></table:table-cell>
+          <table:table-cell office:value-type="string"><text:p>one <text:span>two<text:s/>three</text:span></text:p><text:p>four</text:p></table:table-cell>
+          <table:table-cell office:value-type="string"><office:annotation><text:p>comment</text:p></office:annotation><text:p>noted</text:p></table:table-cell>
+        </table:table-row>
+        <table:table-row table:number-rows-repeated="2">
+          <table:table-cell office:value-type="float" office:value="1.5" table:number-columns-repeated="2"/>
+          <table:table-cell office:value-type="boolean" office:boolean-value="true"/>
+          <table:table-cell office:value-type="date" office:date-value="1900-01-01"/>
+        </table:table-row>
+        <table:table-row>
+          <table:table-cell table:formula="of:=SUM([.A2:.A3])"/>
+          <table:table-cell office:value-type="time" office:time-value="PT12H00M00S"/>
+        </table:table-row>
+        <table:table-row table:number-rows-repeated="1048570"><table:table-cell table:number-columns-repeated="1024"/></table:table-row>
+      </table:table>
+      <table:table table:name="Empty"/>
+    </office:spreadsheet>
+  </office:body>
+</office:document-content>
+"""
+
+XLSX_PARTS = {
+    "xl/workbook.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+  <sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets>
+</workbook>
+""",
+    "xl/_rels/workbook.xml.rels": """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>
+""",
+    "xl/sharedStrings.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+  <si><t>plain</t></si>
+  <si><r><t>rich </t></r><r><t>text</t></r><rPh><t>hint</t></rPh></si>
+</sst>
+""",
+    "xl/worksheets/sheet1.xml": """<?xml version="1.0" encoding="UTF-8"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+  <sheetData>
+    <row r="1">
+      <c r="A1" t="s"><v>0</v></c>
+      <c r="B1" t="s"><v>1</v></c>
+      <c r="C1" t="inlineStr"><is><t>inline</t></is></c>
+    </row>
+    <row r="3">
+      <c r="A3"><v>2.5</v></c>
+      <c r="B3" t="b"><v>1</v></c>
+      <c><f>A3*2</f><v>5</v></c>
+      <c r="E3"><f>A3*3</f></c>
+    </row>
+  </sheetData>
+</worksheet>
+"""
+}
+
+@pytest.fixture
+def ods_file(tmp_path):
+    path = tmp_path / "fixture.ods"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet")
+        archive.writestr("content.xml", ODS_CONTENT)
+    return str(path)
+
+@pytest.fixture
+def xlsx_file(tmp_path):
+    path = tmp_path / "fixture.xlsx"
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, content in XLSX_PARTS.items():
+            archive.writestr(name, content)
+    return str(path)
+
+def test_ods_sheet_names(ods_file):
+    assert SpreadsheetReader(ods_file).sheet_names() == ["Data", "Empty"]
+
+def test_ods_text_expands_spaces_tabs_and_line_breaks(ods_file):
+    assert SpreadsheetReader(ods_file).get_range("Data", "A1:D1") == (("a  b", "x\ty\nz", "one two three\nfour", "noted"),)
+
+def test_ods_typed_values_and_repeats(ods_file):
+    reader = SpreadsheetReader(ods_file)
+    assert reader.get_range("Data", "A2:D3") == ((1.5, 1.5, 1.0, 2.0),) * 2
+    assert reader.get_range("Data", "B4") == ((0.5,),)
+    assert reader.get_range("Data", "E10") == (("",),)
+
+def test_ods_uncached_formula_requires_recalc(ods_file):
+    with pytest.raises(RecalcRequired):
+        SpreadsheetReader(ods_file).get_range("Data", "A4")
+
+def test_xlsx_values(xlsx_file):
+    reader = SpreadsheetReader(xlsx_file)
+    assert reader.sheet_names() == ["Data"]
+    assert reader.get_range("Data", "A1:C1") == (("plain", "rich text", "inline"),)
+    assert reader.get_range("Data", "A2:D3") == (("", "", "", ""), (2.5, 1.0, 5.0, ""))
+
+def test_xlsx_uncached_formula_requires_recalc(xlsx_file):
+    with pytest.raises(RecalcRequired):
+        SpreadsheetReader(xlsx_file).get_range("Data", "E3")
+
+def test_rejects_unsupported_files(tmp_path):
+    path = tmp_path / "fixture.csv"
+    path.write_text("a,b")
+    with pytest.raises(RuntimeError):
+        SpreadsheetReader(str(path))